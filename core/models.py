@@ -10,9 +10,12 @@ This ensures full decoupling and makes the system easily expandable.
 Author: Felipe
 """
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 
+import numpy as np
+
 
 # ---------------------------------------------------------------------------
 # Material
@@ -71,7 +74,7 @@ STEEL_S355 = Material(
 # Geometry
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Node:
     """
     Represents a structural joint in the frame.
@@ -136,6 +139,27 @@ class Member:
         return self.material.sigma_y
 
 
+@dataclass(slots=True, frozen=True)
+class FrameArrays:
+    """
+    Structure-of-arrays view of a frame's geometry and member properties.
+
+    Built once per frame by FrameData.arrays() so that assembly works on
+    contiguous arrays instead of resolving nodes member by member.
+
+    Attributes:
+        node_xyz (np.ndarray): Node coordinates, shape (N, 3); row i holds node ID i.
+        member_conn (np.ndarray): Start and end node IDs, shape (M, 2), int32.
+        member_EAI (np.ndarray): Columns E, A, I per member, shape (M, 3).
+        member_dofs (np.ndarray): 12 global DOF indices per member (start
+                                  node then end node), shape (M, 12), int32.
+    """
+    node_xyz: np.ndarray
+    member_conn: np.ndarray
+    member_EAI: np.ndarray
+    member_dofs: np.ndarray
+
+
 @dataclass
 class FrameData:
     """
@@ -150,14 +174,111 @@ class FrameData:
         nodes (List[Node]): All nodes in the frame.
         members (List[Member]): All members in the frame.
         loads (List[Load]): Applied external loads.
+        element_type (str): "beam" (default) for 12-DOF Euler-Bernoulli
+                            elements, or "truss" for axial-only members.
+                            Truss members add no rotational stiffness, so
+                            every node's rotational DOFs must be fixed.
+        _cache (dict): Solver-private cache of derived data (e.g. the
+                       factorized stiffness matrix, load DOF arrays, id
+                       lookup dicts for get_node/get_member, the
+                       FrameArrays from arrays()). Not
+                       part of the frame definition. Entries that depend on
+                       member failures are validated by their owners; load
+                       and support data is built once, so build a new frame
+                       rather than editing nodes or loads in place (or call
+                       solver.equilibrium.invalidate_stiffness_cache after
+                       editing member materials).
     """
     name: str
     nodes: List[Node]
     members: List[Member]
     loads: List["Load"]
-
-
-@dataclass
+    element_type: str = "beam"
+    _cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Validate element_type against the node supports.
+
+        Raises:
+            ValueError: If element_type is not "beam" or "truss", or if it is
+                        "truss" and a node leaves a rotational DOF (3, 4 or
+                        5) free, which would make K singular.
+        """
+        if self.element_type not in ("beam", "truss"):
+            raise ValueError(
+                f"Unknown element_type {self.element_type!r}; expected 'beam' or 'truss'."
+            )
+        if self.element_type == "truss":
+            free = [n.id for n in self.nodes if not {3, 4, 5}.issubset(n.fixed_dofs)]
+            if free:
+                raise ValueError(
+                    f"Truss frame {self.name!r} has unrestrained rotational DOFs at "
+                    f"nodes {free}; fix DOFs 3, 4 and 5 at every node."
+                )
+
+    def get_node(self, node_id: int) -> Node:
+        """
+        Retrieve a node by ID in O(1) through a cached id -> Node dict.
+
+        Raises:
+            ValueError: If node_id is not found.
+        """
+        by_id = self._cache.get("node_by_id")
+        if by_id is None:
+            by_id = self._cache["node_by_id"] = {node.id: node for node in self.nodes}
+        try:
+            return by_id[node_id]
+        except KeyError:
+            raise ValueError(f"Node {node_id} not found in frame.") from None
+
+    def get_member(self, member_id: int) -> Member:
+        """
+        Retrieve a member by ID in O(1) through a cached id -> Member dict.
+
+        Raises:
+            ValueError: If member_id is not found.
+        """
+        by_id = self._cache.get("member_by_id")
+        if by_id is None:
+            by_id = self._cache["member_by_id"] = {m.id: m for m in self.members}
+        try:
+            return by_id[member_id]
+        except KeyError:
+            raise ValueError(f"Member {member_id} not found in frame.") from None
+
+    def arrays(self) -> FrameArrays:
+        """
+        Return the FrameArrays of this frame, built on first use and cached.
+
+        Failed flags are not included: they change during a simulation,
+        while geometry and sections do not.
+        """
+        cached = self._cache.get("arrays")
+        if cached is None:
+            xyz = np.empty((len(self.nodes), 3))
+            for node in self.nodes:
+                xyz[node.id] = (node.x, node.y, node.z)
+            conn = np.array(
+                [(m.node_start, m.node_end) for m in self.members], dtype=np.int32
+            ).reshape(-1, 2)
+            EAI = np.array([(m.E, m.A, m.I) for m in self.members], dtype=float).reshape(-1, 3)
+            dofs = np.empty((len(conn), 12), dtype=np.int32)
+            dofs[:, :6] = conn[:, 0:1] * 6 + np.arange(6, dtype=np.int32)
+            dofs[:, 6:] = conn[:, 1:2] * 6 + np.arange(6, dtype=np.int32)
+            for a in (xyz, conn, EAI, dofs):
+                a.flags.writeable = False
+            cached = self._cache["arrays"] = FrameArrays(xyz, conn, EAI, dofs)
+        return cached
+
+    def __getstate__(self) -> dict:
+        """Pickle without _cache (derived data; holds unpicklable LU factors)."""
+        state = self.__dict__.copy()
+        state["_cache"] = {}
+        return state
+
+
+@dataclass(slots=True, frozen=True)
 class Load:
     """
     Represents an external force or moment applied at a node.
@@ -177,7 +298,7 @@ class Load:
 # Solver State
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MemberState:
     """
     Snapshot of a single member's physical state at one time step.
@@ -199,28 +320,145 @@ class MemberState:
     failed: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EnergyState:
     """
     Full energy snapshot of the structure at one time step.
 
     Produced by the solver and passed to the entropy module each step.
 
+    Per-member data is stored as parallel NumPy arrays (structure-of-arrays)
+    aligned by index, so the entropy module can read the strain energy and
+    failure columns directly without walking a list of Python objects.
+
     Attributes:
         step (int): Simulation time step index.
         total_energy (float): Sum of all member strain energies (Joules).
-        member_states (List[MemberState]): Per-member energy and force data.
+        member_ids (np.ndarray): Member IDs, shape (n_members,), int.
+        strain_energy (np.ndarray): Strain energy per member (Joules), float64.
+        axial_force (np.ndarray): Axial force per member (Newtons), float64.
+        deformation (np.ndarray): Axial deformation per member (meters), float64.
+        failed (np.ndarray): Failure flag per member, bool.
     """
     step: int
     total_energy: float
-    member_states: List[MemberState]
+    member_ids: np.ndarray
+    strain_energy: np.ndarray
+    axial_force: np.ndarray
+    deformation: np.ndarray
+    failed: np.ndarray
+
+    @classmethod
+    def from_member_states(cls, step: int, member_states: List[MemberState]) -> "EnergyState":
+        """
+        Build an EnergyState from a list of per-member MemberState objects.
+
+        Args:
+            step: Simulation time step index.
+            member_states: Per-member energy and force data.
+
+        Returns:
+            EnergyState with columns packed from member_states and
+            total_energy set to the sum of strain energies.
+        """
+        strain_energy = np.array([ms.strain_energy for ms in member_states], dtype=float)
+        return cls(
+            step=step,
+            total_energy=float(strain_energy.sum()),
+            member_ids=np.array([ms.member_id for ms in member_states], dtype=int),
+            strain_energy=strain_energy,
+            axial_force=np.array([ms.axial_force for ms in member_states], dtype=float),
+            deformation=np.array([ms.deformation for ms in member_states], dtype=float),
+            failed=np.array([ms.failed for ms in member_states], dtype=bool),
+        )
+
+    @property
+    def member_states(self) -> "MemberStateView":
+        """Read-only sequence view yielding MemberState objects on demand."""
+        return MemberStateView(self)
+
+
+class MemberStateView(Sequence):
+    """
+    Sequence of MemberState over the columns of an EnergyState.
+
+    Keeps the old list-of-MemberState interface (len, indexing, iteration)
+    without copying: each MemberState is built only when an element is
+    accessed, so len() or a single lookup costs O(1) rather than O(M)
+    object constructions.
+
+    Attributes:
+        energy_state (EnergyState): State whose columns are viewed.
+    """
+    __slots__ = ("energy_state",)
+
+    def __init__(self, energy_state: EnergyState):
+        self.energy_state = energy_state
+
+    def __len__(self) -> int:
+        return len(self.energy_state.member_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        es = self.energy_state
+        return MemberState(
+            member_id=int(es.member_ids[index]),
+            strain_energy=float(es.strain_energy[index]),
+            axial_force=float(es.axial_force[index]),
+            deformation=float(es.deformation[index]),
+            failed=bool(es.failed[index]),
+        )
+
+    def __iter__(self):
+        es = self.energy_state
+        for mid, u, f, d, fl in zip(
+            es.member_ids.tolist(), es.strain_energy.tolist(), es.axial_force.tolist(),
+            es.deformation.tolist(), es.failed.tolist()
+        ):
+            yield MemberState(member_id=mid, strain_energy=u, axial_force=f, deformation=d, failed=fl)
+
+
+@dataclass(slots=True, frozen=True)
+class MemberResponse:
+    """
+    Per-member section properties and internal end forces for a frame.
+
+    Produced by solver.equilibrium.member_response for the failure check
+    and the redistribution coupling, which would otherwise need the
+    solver's internal member tables. All arrays are aligned with
+    frame.members and must not be modified: the section properties are
+    shared with the solver's per-frame cache.
+
+    Attributes:
+        member_ids (np.ndarray): Member IDs, shape (M,), int.
+        axial_stiffness (np.ndarray): Axial stiffness EA/L (N/m), shape (M,).
+        area (np.ndarray): Cross-sectional areas A (m^2), shape (M,).
+        inertia (np.ndarray): Second moments of area I (m^4), shape (M,).
+        sigma_y (np.ndarray): Yield stresses (Pa), shape (M,).
+        axial_force (np.ndarray | None): Local axial force N (f_local[0],
+                                         Newtons), 0 for failed members;
+                                         None if no load factor was given.
+        end_moments (np.ndarray | None): Local bending moments at the start
+                                         and end (f_local[5], f_local[11],
+                                         N*m), shape (M, 2), 0 for failed
+                                         members; None if no load factor
+                                         was given.
+    """
+    member_ids: np.ndarray
+    axial_stiffness: np.ndarray
+    area: np.ndarray
+    inertia: np.ndarray
+    sigma_y: np.ndarray
+    axial_force: Optional[np.ndarray] = None
+    end_moments: Optional[np.ndarray] = None
 
 
 # ---------------------------------------------------------------------------
 # Entropy Metrics
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EntropyRecord:
     """
     Entropy metrics computed for a single time step.
@@ -235,19 +473,123 @@ class EntropyRecord:
                          Low entropy = localized energy (dangerous).
         delta_entropy (float): Change in entropy from previous step (dS/dt proxy).
                                A large negative spike indicates imminent collapse.
-        energy_distribution (List[Tuple[int, float]]): List of (member_id, p_i)
-                             pairs showing normalized energy per member.
+        energy_distribution (Tuple[np.ndarray, np.ndarray]): (member_ids, p)
+                             parallel arrays, aligned by index, holding the
+                             normalized energy p_i of each active member.
+        gini (Optional[float]): Gini coefficient of the p_i distribution
+                                (localization index). 0.0 = uniform,
+                                approaching 1.0 = concentrated. Set by
+                                compute(); None for records built without
+                                it, in which case localization_index()
+                                derives it from energy_distribution.
     """
     step: int
     entropy: float
     delta_entropy: float
-    energy_distribution: List[Tuple[int, float]]
+    energy_distribution: Tuple[np.ndarray, np.ndarray]
+    gini: Optional[float] = None
+
+    @property
+    def energy_distribution_list(self) -> List[Tuple[int, float]]:
+        """energy_distribution as (member_id, p_i) pairs, built on demand."""
+        ids, p = self.energy_distribution
+        return list(zip(ids.tolist(), p.tolist()))
 
 
 # ---------------------------------------------------------------------------
 # Simulation Output
 # ---------------------------------------------------------------------------
 
+@dataclass
+class HistoryBuffers:
+    """
+    Preallocated per-step history of scalar metrics, stored as NumPy arrays.
+
+    Filled in place by simulation/runner.py — row i holds step i — so no
+    per-step objects are allocated for these values and detectors can scan
+    the history as contiguous slices (e.g. delta[:n]).
+
+    Columns read by collapse detection (entropy, delta) stay float64, since
+    thresholds and z-scores act on small dS differences. The analytics-only
+    gini and p columns are float32. p is the one O(steps x members) buffer,
+    so this halves the history's memory and the traffic of plotting scans.
+
+    Attributes:
+        n (int): Number of steps written so far. Only rows [:n] are valid.
+        step (np.ndarray): Step index per row, shape (max_steps,).
+        total_energy (np.ndarray): Total strain energy per step, shape (max_steps,).
+        entropy (np.ndarray): Structural entropy S per step, shape (max_steps,).
+        delta (np.ndarray): dS per step, shape (max_steps,).
+        gini (np.ndarray): Gini localization index per step, shape (max_steps,),
+                           float32.
+        p (np.ndarray): Normalized energy p_i per member, shape
+                        (max_steps, n_members), float32, columns in frame
+                        member order. Failed members hold 0.0.
+    """
+    n: int
+    step: np.ndarray
+    total_energy: np.ndarray
+    entropy: np.ndarray
+    delta: np.ndarray
+    gini: np.ndarray
+    p: np.ndarray
+
+    @classmethod
+    def allocate(cls, max_steps: int, n_members: int) -> "HistoryBuffers":
+        """
+        Allocate empty buffers for up to max_steps steps.
+
+        Args:
+            max_steps: Maximum number of steps the run can take.
+            n_members: Number of members in the frame.
+
+        Returns:
+            HistoryBuffers with n = 0.
+        """
+        return cls(
+            n=0,
+            step=np.empty(max_steps, dtype=int),
+            total_energy=np.empty(max_steps),
+            entropy=np.empty(max_steps),
+            delta=np.empty(max_steps),
+            gini=np.empty(max_steps, dtype=np.float32),
+            p=np.empty((max_steps, n_members), dtype=np.float32),
+        )
+
+    def record(self, energy_state: EnergyState, entropy_record: EntropyRecord) -> None:
+        """
+        Write one step into the next free row.
+
+        p and Gini are copied from the entropy record rather than derived
+        again, so entropy_record must come from entropy.metrics.compute()
+        on energy_state: its energy_distribution then holds p for exactly
+        the non-failed members, in member order, and gini is set.
+
+        Args:
+            energy_state: Energy state the entropy record was computed from.
+            entropy_record: Entropy metrics for the same step.
+
+        Raises:
+            ValueError: If entropy_record.gini is None (not from compute()).
+        """
+        if entropy_record.gini is None:
+            raise ValueError(
+                f"EntropyRecord for step {entropy_record.step} has no gini; "
+                "record entries produced by entropy.metrics.compute()."
+            )
+        i = self.n
+        self.step[i] = entropy_record.step
+        self.total_energy[i] = energy_state.total_energy
+        self.entropy[i] = entropy_record.entropy
+        self.delta[i] = entropy_record.delta_entropy
+        self.gini[i] = entropy_record.gini
+
+        row = self.p[i]
+        row[:] = 0.0
+        row[~energy_state.failed] = entropy_record.energy_distribution[1]
+        self.n = i + 1
+
+
 @dataclass
 class SimulationResult:
     """
@@ -262,10 +604,13 @@ class SimulationResult:
                                        or None if no collapse occurred.
         failed_sequence (List[int]): Ordered list of member IDs that failed,
                                      in the order they were removed.
+        history (Optional[HistoryBuffers]): Array form of the per-step
+                                            metrics, if recorded by the runner.
     """
     frame_name: str
     energy_history: List[EnergyState]
     entropy_history: List[EntropyRecord]
     collapse_detected: bool
     collapse_step: Optional[int]
-    failed_sequence: List[int]
\ No newline at end of file
+    failed_sequence: List[int]
+    history: Optional[HistoryBuffers] = None
\ No newline at end of file
@@ -14,13 +14,18 @@ Two detection strategies are provided:
 Consumed by simulation/runner.py each step to decide whether to halt.
 """
 
+import math
+from dataclasses import dataclass, field
+
 import numpy as np
-from core.models import EntropyRecord
+from core.models import EntropyRecord, HistoryBuffers
+from entropy.metrics import gini
 
 
 def detect_collapse_threshold(
     history: list[EntropyRecord],
-    threshold: float = -0.5
+    threshold: float = -0.5,
+    buffers: HistoryBuffers | None = None
 ) -> tuple[bool, int | None]:
     """
     Detect collapse when dS/dt drops below a fixed negative threshold.
@@ -32,56 +37,209 @@ def detect_collapse_threshold(
         history: Full entropy record history up to the current step.
         threshold: Negative dS value below which collapse is declared.
                    Default -0.5 (half a nat drop per step).
+        buffers: Optional HistoryBuffers recorded alongside history. If
+                 given, dS is scanned directly from buffers.delta.
 
     Returns:
         (collapsed, step): collapsed is True if detected, step is the
         index where it occurred, or (False, None) if not yet detected.
     """
-    for record in history:
-        if record.delta_entropy < threshold:
-            return True, record.step
-    return False, None
+    if not history:
+        return False, None
+
+    n = len(history)
+    if buffers is not None:
+        deltas, steps = buffers.delta[:n], buffers.step[:n]
+    else:
+        deltas = np.fromiter((r.delta_entropy for r in history), dtype=float, count=n)
+        steps = None
+
+    mask = deltas < threshold
+    idx = int(np.argmax(mask))
+    if not mask[idx]:
+        return False, None
+    return True, int(steps[idx]) if steps is not None else history[idx].step
+
+
+def detect_collapse_threshold_step(
+    delta: float,
+    step: int,
+    threshold: float = -0.5
+) -> tuple[bool, int | None]:
+    """
+    Check a single new dS value against the collapse threshold.
+
+    When called every step, earlier steps have already been checked, so
+    testing only the newest dS is equivalent to detect_collapse_threshold
+    on the full history — in O(1).
+
+    Args:
+        delta: dS for the newest step.
+        step: Index of the newest step.
+        threshold: Negative dS value below which collapse is declared.
+
+    Returns:
+        (True, step) if delta is below threshold, otherwise (False, None).
+    """
+    return (True, step) if delta < threshold else (False, None)
+
+
+@dataclass
+class ZScoreDetector:
+    """
+    Online z-score collapse detector.
+
+    Keeps a running mean and sum of squared deviations of dS (Welford's
+    algorithm), so each new EntropyRecord is checked in O(1) instead of
+    rescanning the whole history. As in detect_collapse_zscore, every dS
+    checked so far is scored against the mean and standard deviation of
+    the whole history, so a step that was not an outlier when it happened
+    can still be flagged later. The running minimum of the checked dS
+    values decides whether any of them is flagged; only then are they
+    scanned for the first one.
+
+    Attributes:
+        z_threshold (float): Number of standard deviations below mean to flag collapse.
+        min_history (int): Minimum number of records before detection activates.
+        n (int): Number of records seen.
+        mean (float): Running mean of dS.
+        m2 (float): Running sum of squared deviations from the mean.
+        triggered_step (int | None): Step at which collapse was flagged, if any.
+    """
+    z_threshold: float = 3.0
+    min_history: int = 5
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    triggered_step: int | None = None
+    _min_delta: float = field(default=math.inf, repr=False)
+    _deltas: list[float] = field(default_factory=list, repr=False)
+    _steps: list[int] = field(default_factory=list, repr=False)
+
+    def observe(self, record: EntropyRecord) -> None:
+        """
+        Fold a record into the running statistics without testing it.
+
+        Used during a warm-up window where detection is disabled but the
+        statistics must still include every step. Observed records are
+        never flagged themselves.
+
+        Args:
+            record: Entropy record for the newest step.
+        """
+        x = record.delta_entropy
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    def update(self, record: EntropyRecord) -> tuple[bool, int | None]:
+        """
+        Fold a new entropy record into the running statistics and test
+        every checked record against them.
+
+        Args:
+            record: Entropy record for the newest step.
+
+        Returns:
+            (collapsed, step): collapsed is True once detected, step is the
+            index of the first flagged record, or (False, None) if not yet
+            detected.
+        """
+        if self.triggered_step is not None:
+            return True, self.triggered_step
+
+        self.observe(record)
+        x = record.delta_entropy
+        self._deltas.append(x)
+        self._steps.append(record.step)
+        self._min_delta = min(self._min_delta, x)
+
+        if self.n < self.min_history:
+            return False, None
+
+        # Population standard deviation, consistent with np.std
+        std = math.sqrt(self.m2 / self.n)
+        if std == 0.0 or (self._min_delta - self.mean) / std >= -self.z_threshold:
+            return False, None
+
+        for delta, step in zip(self._deltas, self._steps):
+            if (delta - self.mean) / std < -self.z_threshold:
+                self.triggered_step = step
+                return True, step
+        return False, None
 
 
 def detect_collapse_zscore(
     history: list[EntropyRecord],
     z_threshold: float = 3.0,
-    min_history: int = 5
+    min_history: int = 5,
+    buffers: HistoryBuffers | None = None
 ) -> tuple[bool, int | None]:
     """
     Detect collapse when dS/dt deviates beyond z_threshold standard deviations
-    below the rolling mean of all previous dS values.
+    below the mean of all dS values in the history.
 
     More adaptive than fixed threshold — works across different frame sizes
     and load magnitudes without manual calibration.
 
+    Scores every step at once and picks the first flagged one with
+    np.argmax. With buffers, dS is read straight
+    from buffers.delta[:len(history)] — a view, no per-call copy. Callers
+    that check every step should hold a ZScoreDetector and call update()
+    with each new record instead.
+
     Args:
         history: Full entropy record history up to the current step.
         z_threshold: Number of standard deviations below mean to flag collapse.
                      Default 3.0 (flags extreme negative outliers).
         min_history: Minimum number of steps required before detection activates.
                      Prevents false positives in early steps.
+        buffers: Optional HistoryBuffers recorded alongside history.
 
     Returns:
         (collapsed, step): collapsed is True if detected, step is the
         index where it occurred, or (False, None) if not yet detected.
     """
-    if len(history) < min_history:
+    n = len(history)
+    if buffers is not None:
+        deltas = buffers.delta[:n]
+    else:
+        deltas = np.fromiter((r.delta_entropy for r in history), dtype=float, count=n)
+
+    idx = _first_zscore_hit(deltas, z_threshold, min_history)
+    if idx is None:
         return False, None
+    return True, int(buffers.step[idx]) if buffers is not None else history[idx].step
 
-    deltas = np.array([r.delta_entropy for r in history])
-    mean = deltas.mean()
-    std = deltas.std()
 
-    if std == 0.0:
-        return False, None
+def _first_zscore_hit(
+    deltas: np.ndarray,
+    z_threshold: float,
+    min_history: int
+) -> int | None:
+    """
+    Find the first index whose dS falls z_threshold population standard
+    deviations below the mean of all of deltas.
 
-    for record in history:
-        z = (record.delta_entropy - mean) / std
-        if z < -z_threshold:
-            return True, record.step
+    Args:
+        deltas: dS values in step order.
+        z_threshold: Number of standard deviations below mean to flag collapse.
+        min_history: Minimum number of values before detection activates.
+
+    Returns:
+        Index of the first flagged value, or None.
+    """
+    if len(deltas) < min_history:
+        return None
+
+    std = deltas.std()
+    if std == 0.0:
+        return None
 
-    return False, None
+    hit = (deltas - deltas.mean()) / std < -z_threshold
+    idx = int(np.argmax(hit))
+    return idx if hit[idx] else None
 
 
 def most_localized_members(
@@ -101,8 +259,23 @@ def most_localized_members(
     Returns:
         List of (member_id, p_i) tuples sorted by p_i descending.
     """
-    sorted_dist = sorted(record.energy_distribution, key=lambda x: x[1], reverse=True)
-    return sorted_dist[:top_n]
+    ids, p = record.energy_distribution
+    n = len(p)
+    if n == 0 or top_n <= 0:
+        return []
+
+    # Single most-loaded member: one argmax scan, no index array
+    if top_n == 1:
+        k = int(np.argmax(p))
+        return [(int(ids[k]), float(p[k]))]
+
+    # O(n) selection of the top_n candidates, then sort only those
+    if top_n < n:
+        idx = np.argpartition(p, -top_n)[-top_n:]
+    else:
+        idx = np.arange(n)
+    order = idx[np.argsort(-p[idx], kind="stable")]
+    return list(zip(ids[order].tolist(), p[order].tolist()))
 
 
 def localization_index(record: EntropyRecord) -> float:
@@ -113,22 +286,17 @@ def localization_index(record: EntropyRecord) -> float:
     0.0 = perfectly uniform (maximum entropy, safe).
     1.0 = all energy in one member (maximum localization, critical).
 
+    compute() already stores this value as record.gini from the same pass
+    that produces S, and it is returned as is. Records built without it
+    (gini=None) get it computed from energy_distribution.
+
     Args:
         record: Current entropy record.
 
     Returns:
         Gini coefficient in [0, 1].
     """
-    if not record.energy_distribution:
-        return 0.0
-
-    values = np.array([p for _, p in record.energy_distribution], dtype=float)
-    values = np.sort(values)
-    n = len(values)
-
-    if n == 0 or values.sum() == 0:
-        return 0.0
-
-    # Standard Gini formula
-    index = np.arange(1, n + 1)
-    return float((2 * np.sum(index * values)) / (n * values.sum()) - (n + 1) / n)
\ No newline at end of file
+    if record.gini is not None:
+        return record.gini
+    _, p = record.energy_distribution
+    return gini(p)
@@ -16,10 +16,19 @@ This is the novel contribution of the project. All other modules exist
 to feed clean EnergyState data into this one.
 """
 
+import math
+
 import numpy as np
+from scipy.special import xlogy
 from core.models import EnergyState, EntropyRecord
 
 
+# Shared, read-only distribution for steps with no active members
+_EMPTY_DISTRIBUTION = (np.zeros(0, dtype=int), np.zeros(0))
+for _column in _EMPTY_DISTRIBUTION:
+    _column.flags.writeable = False
+
+
 def compute(energy_state: EnergyState, previous_entropy: float = 0.0) -> EntropyRecord:
     """
     Compute structural entropy and its rate of change for one time step.
@@ -30,52 +39,75 @@ def compute(energy_state: EnergyState, previous_entropy: float = 0.0) -> Entropy
                           Pass 0.0 for the first step.
 
     Returns:
-        EntropyRecord with S, dS, and normalized energy distribution.
+        EntropyRecord with S, dS, and normalized energy distribution as
+        (member_ids, p) arrays.
     """
-    active = [(ms.member_id, ms.strain_energy)
-              for ms in energy_state.member_states if not ms.failed]
+    energies, ids = _active_columns(energy_state)
 
-    if not active:
+    if energies.size == 0:
         return EntropyRecord(
             step=energy_state.step,
             entropy=0.0,
             delta_entropy=0.0,
-            energy_distribution=[]
+            energy_distribution=_EMPTY_DISTRIBUTION,
+            gini=0.0
         )
 
-    ids, energies = zip(*active)
-    energies = np.array(energies, dtype=float)
-
     total = energies.sum()
 
     if total == 0.0:
-        # No energy in system — fully unloaded or pre-collapse
-        distribution = [(mid, 0.0) for mid in ids]
+        # No energy in system — fully unloaded or pre-collapse.
+        # Strain energies are non-negative, so energies is already all
+        # zeros and doubles as p without a new allocation.
         return EntropyRecord(
             step=energy_state.step,
             entropy=0.0,
             delta_entropy=0.0 - previous_entropy,
-            energy_distribution=distribution
+            energy_distribution=(ids, energies),
+            gini=0.0
         )
 
-    p = energies / total
+    # Normalize once; entropy and Gini are both derived from this p
+    p = energies * (1.0 / total)
     entropy = _shannon_entropy(p)
     delta_entropy = entropy - previous_entropy
-    distribution = list(zip(ids, p.tolist()))
 
     return EntropyRecord(
         step=energy_state.step,
         entropy=entropy,
         delta_entropy=delta_entropy,
-        energy_distribution=distribution
+        energy_distribution=(ids, p),
+        gini=gini(p)
     )
 
 
+def _active_columns(energy_state: EnergyState) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the strain energy and member ID columns of non-failed members.
+
+    Specialized for the common case where no member has failed yet: the
+    columns are returned as-is, skipping the boolean-mask gather (and its
+    two array copies) on every step until the first failure.
+
+    Args:
+        energy_state: Current energy state.
+
+    Returns:
+        (energies, ids) for active members, aligned by index.
+    """
+    failed = energy_state.failed
+    if not failed.any():
+        return energy_state.strain_energy, energy_state.member_ids
+    active = ~failed
+    return energy_state.strain_energy[active], energy_state.member_ids[active]
+
+
 def _shannon_entropy(p: np.ndarray) -> float:
     """
     Compute Shannon entropy H = -sum(p_i * ln(p_i)) over a probability vector.
 
-    Zero-probability terms are excluded (0 * ln(0) = 0 by convention).
+    Zero-probability terms contribute 0 (0 * ln(0) = 0 by convention);
+    xlogy applies this in a single ufunc pass with no mask or temporary.
 
     Args:
         p: Normalized probability vector (must sum to 1.0).
@@ -83,8 +115,33 @@ def _shannon_entropy(p: np.ndarray) -> float:
     Returns:
         Entropy value in nats.
     """
-    nonzero = p[p > 0]
-    return float(-np.sum(nonzero * np.log(nonzero)))
+    return float(-xlogy(p, p).sum())
+
+
+def gini(p: np.ndarray) -> float:
+    """
+    Compute the Gini coefficient of a non-negative distribution.
+
+    0.0 = perfectly uniform (maximum entropy, safe).
+    1.0 = all energy in one member (maximum localization, critical).
+
+    Args:
+        p: Non-negative values, e.g. normalized energy fractions p_i.
+
+    Returns:
+        Gini coefficient in [0, 1], or 0.0 for an empty or all-zero input.
+    """
+    n = len(p)
+    if n == 0:
+        return 0.0
+    cumulative = np.cumsum(np.sort(p))
+    total = cumulative[-1]
+    if total == 0:
+        return 0.0
+
+    # G = 1 + 1/n - 2 * sum(cumsum(v_sorted)) / (n * sum(v)),
+    # equivalent to the rank-weighted form without an index array
+    return float(1.0 + 1.0 / n - 2.0 * cumulative.sum() / (n * total))
 
 
 def max_entropy(n_active_members: int) -> float:
@@ -104,7 +161,7 @@ def max_entropy(n_active_members: int) -> float:
     """
     if n_active_members <= 1:
         return 0.0
-    return float(np.log(n_active_members))
+    return math.log(n_active_members)
 
 
 def normalized_entropy(record: EntropyRecord, n_active_members: int) -> float:
@@ -121,4 +178,23 @@ def normalized_entropy(record: EntropyRecord, n_active_members: int) -> float:
     s_max = max_entropy(n_active_members)
     if s_max == 0.0:
         return 0.0
-    return record.entropy / s_max
\ No newline at end of file
+    return record.entropy / s_max
+
+
+def normalized_entropy_batch(entropy: np.ndarray, n_active_members: np.ndarray) -> np.ndarray:
+    """
+    Vectorized normalized_entropy() over a whole history.
+
+    S_max = ln(n) is evaluated with one np.log over all steps instead of a
+    max_entropy() call per step. Steps with n <= 1 (S_max = 0) give 0.0.
+
+    Args:
+        entropy: Entropy S per step, shape (n_steps,).
+        n_active_members: Number of non-failed members per step, shape (n_steps,).
+
+    Returns:
+        S / S_max per step, shape (n_steps,).
+    """
+    entropy = np.asarray(entropy, dtype=float)
+    s_max = np.log(np.maximum(np.asarray(n_active_members), 1))
+    return np.divide(entropy, s_max, out=np.zeros_like(entropy), where=s_max > 0)
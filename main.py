@@ -7,10 +7,12 @@ Usage:
     python main.py                          # runs default scenario (2d_simple)
     python main.py --scenario 3d_redundant
     python main.py --scenario 2d_simple --method threshold --steps 200
+    python main.py --scenarios 2d_simple,3d_redundant,pratt_bridge
     python main.py --list                   # list available scenarios
 
 Arguments:
     --scenario  : Scenario name from the registry (default: 2d_simple)
+    --scenarios : Comma-separated scenario names, run in parallel processes
     --method    : Collapse detection method — zscore or threshold (default: zscore)
     --steps     : Maximum simulation steps (default: 100)
     --save      : Save figures to disk instead of displaying them
@@ -19,12 +21,10 @@ Arguments:
 
 import argparse
 import os
-
+from core.models import FrameData, SimulationResult
 from structure.frames import frame_2d_simple, frame_3d_redundant, frame_pratt_bridge
 from simulation.runner import run
-from visualization.graph_view import plot_frame, plot_collapse_sequence
-from visualization.entropy_plot import plot_entropy
-from visualization.animation import animate_collapse
+from simulation.batch_runner import run_batch
 
 
 FRAME_MODULES = {
@@ -36,7 +36,11 @@ FRAME_MODULES = {
 
 def main():
     """
-    Parse CLI arguments, run the selected scenario, and display results.
+    Parse CLI arguments, run the selected scenario(s), and display results.
+
+    With --scenarios, each scenario runs in its own worker process (via
+    run_batch) and the results are shown in the order given, once all
+    have finished.
 
     Loads the frame, runs the simulation, then shows:
       1. Frame view at the final step with energy heatmap
@@ -52,27 +56,74 @@ def main():
             print(f"  {name}")
         return
 
-    if args.scenario not in FRAME_MODULES:
-        print(f"Unknown scenario '{args.scenario}'. Use --list to see available options.")
-        return
+    names = args.scenarios or [args.scenario]
 
-    print(f"Running scenario : {args.scenario}")
+    print(f"Running scenario : {', '.join(names)}")
     print(f"Detection method : {args.method}")
     print(f"Max steps        : {args.steps}")
     print(f"Load factor step : {args.load_step}")
     print()
 
-    frame = FRAME_MODULES[args.scenario].build()
+    save_dir = "output_figures" if args.save else None
+    if args.save:
+        os.makedirs(save_dir, exist_ok=True)
+        print(f"Saving figures to: {save_dir}/")
+
+    if len(names) == 1:
+        frame, result = _run_one(names[0], args.steps, args.method, args.load_step)
+        _report(result)
+        _visualize(args, names[0], frame, result, save_dir, prefix="")
+        return
+
+    # Independent scenarios — one worker process each
+    runs = run_batch(
+        names, max_workers=len(names), task=_run_one,
+        max_steps=args.steps, method=args.method, load_step=args.load_step
+    )
+    for name, (frame, result) in zip(names, runs):
+        _report(result)
+        _visualize(args, name, frame, result, save_dir, prefix=f"{name}_")
+
 
+def _run_one(
+    name: str,
+    max_steps: int,
+    method: str,
+    load_step: float
+) -> tuple[FrameData, SimulationResult]:
+    """
+    Build one scenario's frame and run the simulation on it.
+
+    Module-level so it can be dispatched to a worker process.
+
+    Args:
+        name: Scenario name from FRAME_MODULES.
+        max_steps: Maximum simulation steps.
+        method: Collapse detection method.
+        load_step: Load factor increment per step.
+
+    Returns:
+        (frame, result): the frame with its final failed flags, and the
+        SimulationResult of the run.
+    """
+    frame = FRAME_MODULES[name].build()
     result = run(
         frame,
-        max_steps=args.steps,
-        collapse_method=args.method,
+        max_steps=max_steps,
+        collapse_method=method,
         load_factor_start=1.0,
-        load_factor_step=args.load_step,
+        load_factor_step=load_step,
     )
+    return frame, result
 
-    # --- Report summary ---
+
+def _report(result: SimulationResult):
+    """
+    Print a summary of a completed run.
+
+    Args:
+        result: SimulationResult to summarize.
+    """
     print(f"Simulation complete: {result.frame_name}")
     print(f"  Steps run        : {len(result.energy_history)}")
     print(f"  Collapse detected: {result.collapse_detected}")
@@ -82,11 +133,36 @@ def main():
         print(f"  Failure sequence : {result.failed_sequence}")
     print()
 
-    # --- Visualization ---
-    save_dir = "output_figures" if args.save else None
+
+def _visualize(
+    args: argparse.Namespace,
+    name: str,
+    frame: FrameData,
+    result: SimulationResult,
+    save_dir: str | None,
+    prefix: str
+):
+    """
+    Show or save the figures for one completed run.
+
+    Args:
+        args: Parsed CLI arguments.
+        name: Scenario name (used in the animation file name).
+        frame: Frame in its final state.
+        result: SimulationResult of the run.
+        save_dir: Directory for saved figures, or None to display them.
+        prefix: Prepended to saved figure file names, so several scenarios
+                can save into the same directory.
+    """
+    # Imported here so --list and worker processes never load matplotlib
     if args.save:
-        os.makedirs(save_dir, exist_ok=True)
-        print(f"Saving figures to: {save_dir}/")
+        import matplotlib
+        matplotlib.use("Agg")  # Files only: no GUI backend or event loop
+    from visualization.graph_view import plot_frame, plot_collapse_sequence
+    from visualization.entropy_plot import plot_entropy
+
+    def _path(filename: str) -> str | None:
+        return os.path.join(save_dir, prefix + filename) if args.save else None
 
     final_energy = result.energy_history[-1]
     final_entropy = result.entropy_history[-1]
@@ -97,7 +173,7 @@ def main():
         entropy_record=final_entropy,
         step=final_entropy.step,
         show=not args.save,
-        save_path=os.path.join(save_dir, "frame_final.png") if args.save else None
+        save_path=_path("frame_final.png")
     )
 
     if result.collapse_detected:
@@ -105,26 +181,58 @@ def main():
             frame=frame,
             failed_sequence=result.failed_sequence,
             show=not args.save,
-            save_path=os.path.join(save_dir, "collapse_sequence.png") if args.save else None
+            save_path=_path("collapse_sequence.png")
         )
 
     plot_entropy(
         result=result,
         show=not args.save,
-        save_path=os.path.join(save_dir, "entropy_analysis.png") if args.save else None
+        save_path=_path("entropy_analysis.png")
     )
 
     if args.animate:
+        from visualization.animation import animate_collapse
+
         output_path = os.path.join(
             save_dir if args.save else ".",
-            f"collapse_{args.scenario}.{args.animate_fmt}"
+            f"collapse_{name}.{args.animate_fmt}"
         )
         animate_collapse(
             result=result,
             frame=frame,
             output_path=output_path,
             fps=args.fps,
+            min_change=args.min_frame_change,
+        )
+
+
+def _scenario_list(value: str) -> list[str]:
+    """
+    argparse type for --scenarios: split a comma-separated list of names.
+
+    Names are stripped, empty entries dropped and repeats removed (keeping
+    the first occurrence), so "a, b,,a" runs a then b once each.
+
+    Args:
+        value: Raw --scenarios argument.
+
+    Returns:
+        Scenario names from FRAME_MODULES, in the order given.
+
+    Raises:
+        argparse.ArgumentTypeError: If no name is given or a name is not
+                                    in FRAME_MODULES.
+    """
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    if not names:
+        raise argparse.ArgumentTypeError("expected at least one scenario name")
+    unknown = [name for name in names if name not in FRAME_MODULES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown scenario(s) {', '.join(unknown)} "
+            f"(choose from {', '.join(FRAME_MODULES)})"
         )
+    return names
 
 
 def _parse_args() -> argparse.Namespace:
@@ -140,9 +248,14 @@ def _parse_args() -> argparse.Namespace:
         epilog=__doc__
     )
     parser.add_argument(
-        "--scenario", type=str, default="2d_simple",
+        "--scenario", type=str, default="2d_simple", choices=list(FRAME_MODULES),
         help="Scenario name to run (default: 2d_simple)"
     )
+    parser.add_argument(
+        "--scenarios", type=_scenario_list, default=None,
+        help="Comma-separated scenario names to run in parallel processes "
+             "(overrides --scenario)"
+    )
     parser.add_argument(
         "--method", type=str, default="zscore", choices=["zscore", "threshold"],
         help="Collapse detection method (default: zscore)"
@@ -173,6 +286,11 @@ def _parse_args() -> argparse.Namespace:
         "--fps", type=int, default=10,
         help="Frames per second for animation (default: 10)"
     )
+    parser.add_argument(
+        "--min-frame-change", dest="min_frame_change", type=float, default=0.0,
+        help="Skip animation frames until S/S_max plus Gini have changed by "
+             "at least this much (default: 0.0, render every step)"
+    )
     parser.add_argument(
         "--list", action="store_true",
         help="List available scenarios and exit"
@@ -0,0 +1,61 @@
+"""
+simulation/batch_runner.py
+==========================
+Runs many independent frames through the simulation loop — parameter
+sweeps over material grades, load factors or geometry variants of the
+same structure.
+
+Each frame is a separate run of runner.run(); runs share nothing, so they
+are spread across worker processes and scale with the number of cores.
+
+This is the one process-pool entry point: scenarios.run_scenarios and
+main.py --scenarios also go through run_batch, with their own task.
+
+Inputs:  sequence of task inputs (FrameData variants for runner.run)
+Outputs: list of task results (SimulationResult for runner.run), in input order
+"""
+
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TypeVar
+
+from simulation import runner
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def run_batch(
+    items: Sequence[T],
+    max_workers: int | None = None,
+    task: Callable[..., R] = runner.run,
+    **kwargs
+) -> list[R]:
+    """
+    Run task(item, **kwargs) for every item in parallel, one job per item.
+
+    With the default task each item is a FrameData. Each worker receives a
+    pickled copy of its item, so the failed flags of the caller's frames
+    are left untouched.
+
+    Args:
+        items: Inputs for task — frames to simulate with the default
+               runner.run, scenario names for run_scenario, and so on.
+        max_workers: Maximum worker processes. Default None lets
+                     ProcessPoolExecutor choose (number of CPUs).
+        task: Module-level (picklable) callable run in the workers, taking
+              one item as its first argument. Default runner.run.
+              run_scenarios passes scenario names with run_scenario instead.
+        **kwargs: Passed to task for every item
+                  (e.g. max_steps=200, load_factor_step=0.2).
+
+    Returns:
+        List of task results (SimulationResult for runner.run), one per
+        item, in the order of items.
+    """
+    if not items:
+        return []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(partial(task, **kwargs), items))
@@ -15,12 +15,15 @@ Inputs:  FrameData (from any frame in structure/frames/)
 Outputs: SimulationResult (consumed by visualization/)
 """
 
-from core.models import FrameData, SimulationResult, EnergyState, EntropyRecord
+import dataclasses
+from typing import Callable
+
+from core.models import FrameData, SimulationResult, EnergyState, EntropyRecord, HistoryBuffers
 from solver.equilibrium import solve
 from solver.failure import check_and_apply_failures, all_failed
 from solver.redistribution import redistribute
 from entropy.metrics import compute as compute_entropy
-from entropy.localization import detect_collapse_zscore, detect_collapse_threshold
+from entropy.localization import ZScoreDetector, detect_collapse_threshold_step
 
 
 def run(
@@ -32,6 +35,7 @@ def run(
     collapse_zscore: float = 3.0,
     load_factor_start: float = 1.0,
     load_factor_step: float = 0.0,
+    min_detect_step: int = 0,
 ) -> SimulationResult:
     """
     Execute the full progressive collapse simulation for a given frame.
@@ -50,96 +54,133 @@ def run(
                           Default 0.0 = static loading (no incremental ramp).
                           Set e.g. 0.1 to increase load by 10% per step and
                           drive progressive failures under real material limits.
+        min_detect_step: First step at which collapse detection runs. Earlier
+                         steps skip the check entirely (the z-score detector
+                         still folds them into its statistics, but never
+                         flags them). Default 0
+                         checks every step.
 
     Returns:
         SimulationResult with full energy and entropy history.
     """
-    energy_history: list[EnergyState] = []
-    entropy_history: list[EntropyRecord] = []
+    # Preallocated and indexed by step; truncated to the steps run on early exit
+    energy_history: list[EnergyState] = [None] * max_steps
+    entropy_history: list[EntropyRecord] = [None] * max_steps
     failed_sequence: list[int] = []
+    history = HistoryBuffers.allocate(max_steps, len(frame.members))
     previous_entropy = 0.0
+    zscore_detector = ZScoreDetector(z_threshold=collapse_zscore)
+    detect = _bind_detector(collapse_method, collapse_threshold, zscore_detector)
+    # Steps before min_detect_step still feed the z-score statistics
+    warm_up = zscore_detector.observe if collapse_method == "zscore" else None
+    record_history = history.record
+    name = frame.name
+    # True while the frame and load are unchanged since the last solve, so the
+    # previous equilibrium (and its failure check) still holds
+    steady = False
 
     for step in range(max_steps):
 
         load_factor = load_factor_start + step * load_factor_step
 
-        # --- Step 1: Solve equilibrium ---
-        energy_state = solve(frame, step, load_factor=load_factor)
-        energy_history.append(energy_state)
+        # --- Step 1: Solve equilibrium (reused if nothing changed) ---
+        if steady:
+            energy_state = dataclasses.replace(energy_history[step - 1], step=step)
+        else:
+            energy_state = solve(frame, step, load_factor=load_factor)
+        energy_history[step] = energy_state
 
         # --- Step 2: Compute entropy ---
         entropy_record = compute_entropy(energy_state, previous_entropy)
-        entropy_history.append(entropy_record)
+        entropy_history[step] = entropy_record
+        record_history(energy_state, entropy_record)
         previous_entropy = entropy_record.entropy
 
         # --- Step 3: Check for collapse ---
-        collapsed, collapse_step = _detect(
-            entropy_history, collapse_method, collapse_threshold, collapse_zscore
-        )
+        if step >= min_detect_step:
+            collapsed, collapse_step = detect(entropy_record)
+        else:
+            collapsed = False
+            if warm_up is not None:
+                warm_up(entropy_record)
         if collapsed:
             return SimulationResult(
-                frame_name=frame.name,
-                energy_history=energy_history,
-                entropy_history=entropy_history,
+                frame_name=name,
+                energy_history=energy_history[:step + 1],
+                entropy_history=entropy_history[:step + 1],
                 collapse_detected=True,
                 collapse_step=collapse_step,
-                failed_sequence=failed_sequence
+                failed_sequence=failed_sequence,
+                history=history
             )
 
         # --- Step 4: Check member failures ---
-        newly_failed = check_and_apply_failures(frame, energy_state, load_factor=load_factor)
-        failed_sequence.extend(newly_failed)
+        if steady:
+            newly_failed = []
+        else:
+            newly_failed = check_and_apply_failures(frame, energy_state, load_factor=load_factor)
+            failed_sequence.extend(newly_failed)
+        steady = not newly_failed and load_factor_step == 0.0
 
         if all_failed(frame):
             return SimulationResult(
-                frame_name=frame.name,
-                energy_history=energy_history,
-                entropy_history=entropy_history,
+                frame_name=name,
+                energy_history=energy_history[:step + 1],
+                entropy_history=entropy_history[:step + 1],
                 collapse_detected=True,
                 collapse_step=step,
-                failed_sequence=failed_sequence
+                failed_sequence=failed_sequence,
+                history=history
             )
 
         # --- Step 5: Redistribute energy if failures occurred ---
         if newly_failed:
             energy_state = redistribute(frame, energy_state, redistribution_dt)
-            energy_history[-1] = energy_state  # Replace with post-redistribution state
+            energy_history[step] = energy_state  # Replace with post-redistribution state
 
     # Max steps reached without collapse
     return SimulationResult(
-        frame_name=frame.name,
+        frame_name=name,
         energy_history=energy_history,
         entropy_history=entropy_history,
         collapse_detected=False,
         collapse_step=None,
-        failed_sequence=failed_sequence
+        failed_sequence=failed_sequence,
+        history=history
     )
 
 
-def _detect(
-    entropy_history: list[EntropyRecord],
+def _bind_detector(
     method: str,
     threshold: float,
-    zscore: float
-) -> tuple[bool, int | None]:
+    zscore_detector: ZScoreDetector
+) -> Callable[[EntropyRecord], tuple[bool, int | None]]:
     """
-    Dispatch to the selected collapse detection strategy.
+    Resolve the selected collapse detection strategy once, before the loop.
+
+    The returned callable takes the newest entropy record and returns
+    (collapsed, step). Both strategies are online and run in O(1) per step.
+    The threshold test depends only on the new dS. The z-score detector
+    re-scores earlier steps against the updated statistics through their
+    running minimum.
 
     Args:
-        entropy_history: Full entropy record history so far.
         method: "zscore" or "threshold".
         threshold: Used if method is "threshold".
-        zscore: Used if method is "zscore".
+        zscore_detector: Running detector (Welford mean/variance of dS)
+                         fed each record if method is "zscore".
 
     Returns:
-        (collapsed, step) from the chosen detector.
+        Detector callable for the chosen strategy.
 
     Raises:
         ValueError: If method is not recognized.
     """
     if method == "zscore":
-        return detect_collapse_zscore(entropy_history, z_threshold=zscore)
+        return zscore_detector.update
     elif method == "threshold":
-        return detect_collapse_threshold(entropy_history, threshold=threshold)
+        return lambda record: detect_collapse_threshold_step(
+            record.delta_entropy, record.step, threshold
+        )
     else:
-        raise ValueError(f"Unknown collapse detection method: '{method}'. Use 'zscore' or 'threshold'.")
\ No newline at end of file
+        raise ValueError(f"Unknown collapse detection method: '{method}'. Use 'zscore' or 'threshold'.")
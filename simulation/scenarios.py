@@ -15,6 +15,7 @@ To add a new scenario:
 
 from core.models import SimulationResult
 from simulation import runner
+from simulation.batch_runner import run_batch
 from structure.frames import frame_2d_simple, frame_3d_redundant, frame_pratt_bridge
 
 
@@ -137,6 +138,41 @@ def run_scenario(name: str, **kwargs) -> SimulationResult:
     return SCENARIOS[name](**kwargs)
 
 
+def run_scenarios(
+    names: list[str],
+    max_workers: int | None = None,
+    **kwargs
+) -> dict[str, SimulationResult]:
+    """
+    Run several scenarios in parallel, one worker process per scenario.
+
+    Scenarios are fully independent, so they scale with the number of
+    cores. Names are validated before any process is started, then
+    run_batch() calls run_scenario for each name.
+
+    Args:
+        names: Scenario keys from SCENARIOS registry.
+        max_workers: Maximum worker processes. Default None lets
+                     ProcessPoolExecutor choose (number of CPUs).
+        **kwargs: Passed to every scenario function
+                  (e.g. max_steps=200, collapse_method="threshold").
+
+    Returns:
+        Dict mapping each scenario name to its SimulationResult, in the
+        order of names.
+
+    Raises:
+        ValueError: If any scenario name is not found in registry.
+    """
+    for name in names:
+        if name not in SCENARIOS:
+            available = ", ".join(SCENARIOS.keys())
+            raise ValueError(f"Unknown scenario '{name}'. Available: {available}")
+
+    results = run_batch(names, max_workers=max_workers, task=run_scenario, **kwargs)
+    return dict(zip(names, results))
+
+
 def list_scenarios() -> list[str]:
     """Return all registered scenario names."""
     return list(SCENARIOS.keys())
\ No newline at end of file
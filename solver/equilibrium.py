@@ -9,27 +9,43 @@ Strain energy is computed as:
 
 This captures both axial and bending contributions correctly.
 
-MemberState.axial_force stores the true axial force (f_local[0]),
+EnergyState.axial_force stores the true axial force (f_local[0]),
 not the full force magnitude. This keeps the failure criterion
 (axial_force >= sigma_y * A) physically meaningful.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
 import numpy as np
-from core.models import FrameData, EnergyState, MemberState
+import scipy.sparse as sp
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+from scipy.sparse.linalg import splu
+from core.models import FrameData, EnergyState, MemberResponse
 from structure.stiffness import (
-    assemble_global_stiffness,
-    apply_boundary_conditions,
-    _local_stiffness,
-    _transformation_matrix,
-    _get_node,
-    _member_length
+    _element_matrices,
+    _fixed_dofs
 )
 
 
+# Active member count from which _member_kernel shards work across threads
+_PARALLEL_MIN_MEMBERS = 20_000
+
+# Fraction of members that may change failed state before the cached RCM
+# ordering of K_ff is recomputed.
+_RCM_REUSE_FRACTION = 0.05
+
+
 def solve(frame: FrameData, step: int, load_factor: float = 1.0) -> EnergyState:
     """
     Solve Ku = F for the current frame state and return an EnergyState.
 
+    K is assembled sparse and reduced to the free DOFs (K_ff u_f = F_f), and
+    only changes when members fail, so its sparse LU factorization is cached
+    on the frame and reused across steps; each step then costs a load vector
+    build and two sparse triangular solves. Constrained DOFs stay at u = 0.
+
     Args:
         frame: Current frame definition (members may be partially failed).
         step: Current simulation step index.
@@ -40,155 +56,549 @@ def solve(frame: FrameData, step: int, load_factor: float = 1.0) -> EnergyState:
     Returns:
         EnergyState with per-member strain energies and forces.
     """
-    K = assemble_global_stiffness(frame)
-    K = apply_boundary_conditions(K, frame)
-    F = _build_load_vector(frame, load_factor=load_factor)
-    F = apply_boundary_conditions_to_force(F, frame)
-    u = _solve_system(K, F)
+    failed = _failed_mask(frame)
+    u = _displacements(frame, load_factor, failed)
+
+    tables = _member_tables(frame)
+    n = len(frame.members)
+    strain_energy = np.zeros(n)
+    axial_force   = np.zeros(n)
+    deformation   = np.zeros(n)
+    _member_kernel(tables, ~failed, u, strain_energy, axial_force, deformation)
+
+    return EnergyState(
+        step=step,
+        total_energy=float(strain_energy.sum()),
+        member_ids=tables.member_ids,
+        strain_energy=strain_energy,
+        axial_force=axial_force,
+        deformation=deformation,
+        failed=failed,
+    )
 
-    member_states = [
-        _compute_member_state(member, u, frame)
-        for member in frame.members
-    ]
 
-    total_energy = sum(ms.strain_energy for ms in member_states)
+def member_response(
+    frame: FrameData,
+    load_factor: float | None = None,
+    failed: np.ndarray | None = None
+) -> MemberResponse:
+    """
+    Return per-member section properties and, given a load, end forces.
+
+    The section properties come from the cached member tables. With a
+    load_factor, the local axial force and end moments of every active
+    member are recovered in one batched pass from the displacement vector
+    solve() cached for the same failure state and load (solving with the
+    cached factorization if there is none).
+
+    Args:
+        frame: Current frame state.
+        load_factor: Scalar multiplier applied to all loads, or None to
+                     skip the solve and return section properties only.
+        failed: Failed flags per member, shape (M,); defaults to the
+                frame's current failure state.
+
+    Returns:
+        MemberResponse aligned with frame.members.
+    """
+    tables = _member_tables(frame)
+    if load_factor is None:
+        return MemberResponse(
+            tables.member_ids, tables.k_axial, tables.A_all, tables.I_all, tables.sigma_y_all
+        )
 
-    return EnergyState(step=step, total_energy=total_energy, member_states=member_states)
+    if failed is None:
+        failed = _failed_mask(frame)
+    u = _displacements(frame, load_factor, failed)
+
+    # Only N and the two end moments are needed: rows 0, 5, 11 of k T u
+    rows = _active_rows(~failed)
+    forces = np.zeros((len(frame.members), 3))
+    forces[rows] = np.einsum("mri,mi->mr", tables.force_rows[rows], u[tables.dof_idx[rows]])
+
+    return MemberResponse(
+        tables.member_ids, tables.k_axial, tables.A_all, tables.I_all, tables.sigma_y_all,
+        axial_force=forces[:, 0], end_moments=forces[:, 1:]
+    )
+
+
+def _displacements(frame: FrameData, load_factor: float, failed: np.ndarray | None = None) -> np.ndarray:
+    """
+    Return the displacement vector u for the current failure state and load.
+
+    The last result is cached in frame._cache keyed by (failed flags,
+    load_factor), so check_and_apply_failures, which runs right after
+    solve() on the same state, reuses u instead of solving again.
+
+    Args:
+        frame: Current frame state.
+        load_factor: Scalar multiplier applied to all loads.
+        failed: Failed flags from _failed_mask, if already computed.
+
+    Returns:
+        u (np.ndarray): Read-only displacement vector of shape (n_dof,).
+    """
+    if failed is None:
+        failed = _failed_mask(frame)
+    key = (failed.tobytes(), load_factor)
+    cached = frame._cache.get("displacements")
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    F = _build_load_vector(frame, load_factor=load_factor)
+    u = _solve_factorized(_stiffness_factorization(frame, failed), F)
+    u.flags.writeable = False
+    frame._cache["displacements"] = (key, u)
+    return u
 
 
 def _build_load_vector(frame: FrameData, load_factor: float = 1.0) -> np.ndarray:
     """
     Assemble the global force vector F from all applied loads.
 
+    The unit-factor vector is scattered once (np.add.at, so several loads
+    on one DOF sum) and cached; each call is then a single scaled copy.
+
     Args:
         frame: Frame definition containing load list.
         load_factor: Scalar multiplier applied to all load magnitudes.
                      Default 1.0 preserves backward-compatible behaviour.
 
+    Returns:
+        F (np.ndarray): Force vector of shape (n_dof,). A fresh array the
+        caller may modify.
+    """
+    return _unit_load_vector(frame) * load_factor
+
+
+def _unit_load_vector(frame: FrameData) -> np.ndarray:
+    """
+    Return the global force vector at load factor 1.0.
+
+    Built on first use and cached in frame._cache; loads are fixed for the
+    lifetime of a frame. Treat the result as read-only.
+
+    Args:
+        frame: Frame definition containing load list.
+
     Returns:
         F (np.ndarray): Force vector of shape (n_dof,).
     """
-    n_dof = len(frame.nodes) * 6
-    F = np.zeros(n_dof)
-    for load in frame.loads:
-        global_dof = load.node_id * 6 + load.dof
-        F[global_dof] += load.magnitude * load_factor
-    return F
+    cached = frame._cache.get("loads")
+    if cached is None:
+        dof_idx = np.array([load.node_id * 6 + load.dof for load in frame.loads], dtype=np.int64)
+        magnitudes = np.array([load.magnitude for load in frame.loads], dtype=float)
+        cached = np.zeros(len(frame.nodes) * 6)
+        np.add.at(cached, dof_idx, magnitudes)
+        cached.flags.writeable = False
+        frame._cache["loads"] = cached
+    return cached
+
+
+def _failed_mask(frame: FrameData) -> np.ndarray:
+    """
+    Return the member failed flags as a bool array in frame.members order.
+
+    Args:
+        frame: Current frame state.
+
+    Returns:
+        Bool array of shape (n_members,).
+    """
+    return np.fromiter((m.failed for m in frame.members), dtype=bool, count=len(frame.members))
 
 
-def _solve_system(K: np.ndarray, F: np.ndarray) -> np.ndarray:
+def _stiffness_factorization(frame: FrameData, failed: np.ndarray | None = None) -> tuple:
     """
-    Solve the linear system Ku = F.
-    Falls back to least-squares if K is singular.
+    Return the factorization of the free-DOF stiffness block K_ff.
+
+    Fixed DOFs are dropped at assembly (_assemble_free) rather than by
+    zeroing rows/columns of K, so K_ff is smaller and needs no
+    boundary-condition pass. The free
+    DOFs are then put in Reverse Cuthill-McKee order, which clusters K_ff's
+    nonzeros around the diagonal: node IDs in the frame files follow no
+    spatial order, and a narrow band limits fill-in in the LU factors.
+    The ordering itself is reused across failure states while few members
+    have changed (see _rcm_permutation).
+
+    The factorization is cached in frame._cache, keyed by the member failed
+    flags. It is rebuilt only when they change, i.e. after
+    check_and_apply_failures marks new failures.
 
     Args:
-        K: Global stiffness matrix.
-        F: Global force vector.
+        frame: Current frame state.
+        failed: Failed flags from _failed_mask, if already computed.
 
     Returns:
-        u (np.ndarray): Displacement vector of shape (n_dof,).
+        (lu, K_pinv, free): the splu factorization of K_ff, or None if K_ff
+        is singular, in which case K_pinv holds its pseudo-inverse instead
+        (None otherwise); and the free global DOF indices in the RCM order
+        the factors use.
     """
+    if failed is None:
+        failed = _failed_mask(frame)
+    signature = failed.tobytes()
+    cached = frame._cache.get("stiffness")
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    free = _free_dof_indices(frame)
+    K_ff = _assemble_free(frame, ~failed)
+    perm = _rcm_permutation(frame, K_ff, failed)
+    free = free[perm]
+    K_ff = K_ff[perm][:, perm].tocsc()
+    K_pinv = None
     try:
-        u = np.linalg.solve(K, F)
-    except np.linalg.LinAlgError:
-        u = np.linalg.lstsq(K, F, rcond=None)[0]
+        # RCM already ordered the columns; keep that order in the factors
+        lu = splu(K_ff, permc_spec="NATURAL")
+    except RuntimeError:
+        # Exactly singular — mechanism after failures. Pay for the SVD once
+        # per failure state; rtol matches lstsq's default cutoff.
+        lu = None
+        K_pinv = np.linalg.pinv(K_ff.toarray(), rtol=np.finfo(float).eps * len(free))
+    factorization = (lu, K_pinv, free)
+    frame._cache["stiffness"] = (signature, factorization)
+    return factorization
+
+
+def _rcm_permutation(frame: FrameData, K_ff: sp.csr_matrix, failed: np.ndarray) -> np.ndarray:
+    """
+    Return a Reverse Cuthill-McKee ordering for K_ff, reusing the last one.
+
+    A failure only removes one member's entries from K_ff, so the ordering
+    computed for an earlier failure state still gives a near-optimal band.
+    The cached permutation is reused while fewer than _RCM_REUSE_FRACTION
+    of the members have changed failed state since it was computed; the
+    free DOF set never changes with failures, so it always stays valid.
+
+    Args:
+        frame: Current frame state.
+        K_ff: Free-DOF stiffness block in global DOF order.
+        failed: Current member failed flags.
+
+    Returns:
+        perm (np.ndarray): Permutation of the rows/columns of K_ff.
+    """
+    cached = frame._cache.get("rcm")
+    if cached is not None:
+        changed = np.count_nonzero(cached[0] != failed)
+        if changed < _RCM_REUSE_FRACTION * failed.size:
+            return cached[1]
+
+    perm = reverse_cuthill_mckee(K_ff, symmetric_mode=True)
+    frame._cache["rcm"] = (failed.copy(), perm)
+    return perm
+
+
+def invalidate_stiffness_cache(frame: FrameData) -> None:
+    """
+    Drop the cached member tables, stiffness factorization, displacements
+    and coupling matrix of a frame.
+
+    Member failures never need this: those caches are keyed by the failed
+    flags and rebuild themselves. Call it after editing member materials or
+    node coordinates of an already-solved frame in place, which the caches
+    cannot detect.
+
+    Args:
+        frame: Frame whose derived stiffness data should be rebuilt.
+    """
+    for key in ("arrays", "elements", "members", "free_triplets", "stiffness", "rcm", "displacements", "coupling"):
+        frame._cache.pop(key, None)
+
+
+def _assemble_free(frame: FrameData, active: np.ndarray) -> sp.csr_matrix:
+    """
+    Assemble the free-DOF block K_ff directly from cached COO triplets.
+
+    The element blocks of all members are scattered once, in free-DOF
+    numbering with fixed-DOF entries dropped, and cached in frame._cache.
+    A member failure then only removes that member's 144 triplets before
+    the COO -> CSR conversion; no T^T k T, index building or [free][:, free]
+    slicing is redone. Dropping triplets rather than subtracting the
+    failed block from an assembled K keeps the result bit-identical to a
+    fresh assembly: a numerical downdate leaves roundoff where the
+    stiffness should vanish, which would hide mechanisms from splu.
+
+    Args:
+        frame: Current frame state.
+        active: True for non-failed members, shape (M,).
+
+    Returns:
+        K_ff (sp.csr_matrix): Free-DOF stiffness block in global DOF order.
+    """
+    cached = frame._cache.get("free_triplets")
+    if cached is None:
+        tables = _member_tables(frame)
+        free = _free_dof_indices(frame)
+        position = np.full(len(frame.nodes) * 6, -1)
+        position[free] = np.arange(free.size)
+        dofs = position[tables.dof_idx]
+        rows = np.repeat(dofs, 12, axis=1).ravel()
+        cols = np.tile(dofs, (1, 12)).ravel()
+        keep = (rows >= 0) & (cols >= 0)
+        owner = np.repeat(np.arange(len(tables.member_ids)), 144)[keep]
+        cached = frame._cache["free_triplets"] = (
+            rows[keep], cols[keep], tables.kg_all.ravel()[keep], owner, free.size
+        )
+
+    rows, cols, data, owner, n_free = cached
+    if not active.all():
+        keep = active[owner]
+        rows, cols, data = rows[keep], cols[keep], data[keep]
+    return sp.coo_matrix((data, (rows, cols)), shape=(n_free, n_free)).tocsr()
+
+
+def _solve_factorized(factorization: tuple, F: np.ndarray) -> np.ndarray:
+    """
+    Solve Ku = F using a cached factorization from _stiffness_factorization.
+    Falls back to the cached pseudo-inverse (the least-squares solution) if
+    K is singular. This only happens once failures have turned the frame
+    into a mechanism, and iterative LSQR converges poorly on those
+    inconsistent systems.
+
+    Args:
+        factorization: (lu, K_pinv, free) triple.
+        F: Global force vector. Entries at fixed DOFs are ignored.
+
+    Returns:
+        u (np.ndarray): Displacement vector of shape (n_dof,), zero at
+        fixed DOFs.
+    """
+    lu, K_pinv, free = factorization
+    u = np.zeros_like(F)
+    if lu is None:
+        u[free] = K_pinv @ F[free]
+    else:
+        u[free] = lu.solve(F[free])
     return u
 
 
-def apply_boundary_conditions_to_force(F: np.ndarray, frame: FrameData) -> np.ndarray:
+def _fixed_dof_indices(frame: FrameData) -> np.ndarray:
     """
-    Zero out force vector entries at constrained DOFs.
+    Return the global indices of all constrained DOFs.
 
-    When apply_boundary_conditions sets K[dof,dof]=1 and K[dof,:]=0,
-    the system solves as u[dof] = F[dof]. If F[dof] is non-zero
-    (e.g. a load applied directly at a support), the result is a
-    spurious displacement equal to the load magnitude in meters.
+    Built on first use and cached in frame._cache; supports are fixed for
+    the lifetime of a frame.
 
-    This function ensures F[dof]=0 at all fixed DOFs so the solver
-    returns u[dof]=0 as expected for a constrained degree of freedom.
+    Args:
+        frame: Frame with node boundary conditions.
+
+    Returns:
+        Int array of fixed global DOF indices.
+    """
+    cached = frame._cache.get("fixed_dofs")
+    if cached is None:
+        cached = frame._cache["fixed_dofs"] = _fixed_dofs(frame)
+    return cached
+
+
+def _free_dof_indices(frame: FrameData) -> np.ndarray:
+    """
+    Return the global indices of all unconstrained DOFs, in ascending order.
+
+    Complement of _fixed_dof_indices, cached in frame._cache alongside it.
 
     Args:
-        F: Global force vector (modified in-place).
         frame: Frame with node boundary conditions.
 
     Returns:
-        F (np.ndarray): Modified force vector.
+        Int array of free global DOF indices.
+    """
+    cached = frame._cache.get("free_dofs")
+    if cached is None:
+        free = np.ones(len(frame.nodes) * 6, dtype=bool)
+        free[_fixed_dof_indices(frame)] = False
+        cached = frame._cache["free_dofs"] = np.flatnonzero(free)
+    return cached
+
+
+@dataclass
+class _MemberTables:
+    """
+    Per-member geometry and stiffness stacked into contiguous arrays,
+    indexed by position in frame.members.
+
+    None of these depend on failure state (a failed member is masked out,
+    not changed), so the tables are built once per frame and cached.
+
+    Attributes:
+        member_ids (np.ndarray): Member IDs, shape (M,).
+        starts (np.ndarray): Start node IDs, shape (M,).
+        ends (np.ndarray): End node IDs, shape (M,).
+        dof_idx (np.ndarray): 12 global DOF indices per member (start node
+                              0..5, end node 6..11), shape (M, 12).
+        kg_all (np.ndarray): Global element stiffness T^T k T, shape (M, 12, 12).
+        force_rows (np.ndarray): Rows 0, 5 and 11 of k T, mapping global
+                                 DOFs to the local axial force and the end
+                                 moments, shape (M, 3, 12).
+        axis_all (np.ndarray): Unit member axes, shape (M, 3).
+        L_all (np.ndarray): Member lengths, shape (M,).
+        A_all (np.ndarray): Cross-sectional areas, shape (M,).
+        I_all (np.ndarray): Second moments of area, shape (M,).
+        k_axial (np.ndarray): Axial stiffness EA/L (k_local[0, 0]), shape (M,).
+        sigma_y_all (np.ndarray): Yield stresses, shape (M,).
+
+    T and k themselves are not kept: every consumer needs only their
+    products above, so holding the two extra (M, 12, 12) stacks would
+    double the tables' memory for nothing.
+    """
+    member_ids: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    dof_idx: np.ndarray
+    kg_all: np.ndarray
+    force_rows: np.ndarray
+    axis_all: np.ndarray
+    L_all: np.ndarray
+    A_all: np.ndarray
+    I_all: np.ndarray
+    k_axial: np.ndarray
+    sigma_y_all: np.ndarray
+
+
+def _member_tables(frame: FrameData) -> _MemberTables:
     """
-    for node in frame.nodes:
-        for dof in node.fixed_dofs:
-            F[node.id * 6 + dof] = 0.0
-    return F
+    Return the per-member arrays consumed by _member_kernel.
 
+    Built on the first call and cached in frame._cache; later calls are a
+    dict lookup instead of M transformation/stiffness constructions.
 
-def _compute_member_state(member, u: np.ndarray, frame: FrameData) -> MemberState:
+    Args:
+        frame: Current frame state.
+
+    Returns:
+        _MemberTables for frame.members.
+    """
+    cached = frame._cache.get("members")
+    if cached is not None:
+        return cached
+
+    members = frame.members
+    M = len(members)
+    arrays = frame.arrays()
+    member_ids = np.fromiter((m.id for m in members), dtype=int, count=M)
+    starts, ends = arrays.member_conn.T.astype(int)
+    E, A, I = arrays.member_EAI.T.copy()
+    elements = _element_matrices(frame)
+
+    tables = _MemberTables(
+        member_ids, starts, ends, arrays.member_dofs,
+        elements.k_global, elements.kT[:, [0, 5, 11], :], elements.axis, elements.L,
+        A, I, E * A / elements.L,
+        np.fromiter((m.sigma_y for m in members), dtype=float, count=M)
+    )
+    frame._cache["members"] = tables
+    return tables
+
+
+def _member_kernel(
+    tables: _MemberTables,
+    active: np.ndarray,
+    u: np.ndarray,
+    out_U: np.ndarray,
+    out_F: np.ndarray,
+    out_D: np.ndarray
+) -> None:
     """
-    Compute strain energy and axial force for a single member.
+    Compute strain energy, axial force and deformation for all active members.
 
-    Procedure:
-        1. Extract 12 global DOFs for the member's two nodes
-        2. Transform to local coordinates: u_local = T @ u_global
-        3. Compute internal forces: f_local = k_local @ u_local
-        4. Strain energy: U = 0.5 * u_local^T @ f_local
-        5. Axial force: f_local[0] (local x-direction)
+    Procedure, batched over the active members:
+        1. Gather 12 global DOFs per member into a (n_active, 12) block
+        2. Strain energy: U = 0.5 * u_global^T @ (T^T k T) @ u_global,
+           which equals 0.5 * u_local^T @ k_local @ u_local
+        3. Axial force: f_local[0] = (k T)[0] @ u_global (local x-direction)
 
-    Axial force is stored in MemberState.axial_force. The failure criterion
-    (sigma_y * A) is compared against abs(axial_force) — compression members
-    have negative axial force, tension members positive.
+    T^T k T and row 0 of k T are precomputed per member, so a step is one
+    stacked 12x12 matvec plus two row dot products instead of the two
+    chained products through u_local and f_local.
+
+    The failure criterion (sigma_y * A) is compared against abs(axial_force)
+    — compression members have negative axial force, tension members positive.
 
     Strain energy is always non-negative; any negative result from numerical
     noise is clamped to zero.
 
+    Each step is one stacked matmul/einsum over the cached (M, 12, 12)
+    tables rather than M small Python-level products. Failed members are
+    skipped, leaving their output entries untouched. Frames with at least
+    _PARALLEL_MIN_MEMBERS active members are split into shards computed on
+    a thread pool; below that the pool overhead outweighs the gain.
+
     Args:
-        member: Member to evaluate.
+        tables: Per-member arrays from _member_tables.
+        active: True for non-failed members, shape (M,).
         u: Global displacement vector.
-        frame: Frame geometry.
+        out_U: Strain energy per member (written in place).
+        out_F: Axial force per member (written in place).
+        out_D: Axial deformation per member (written in place).
+    """
+    n_active = int(np.count_nonzero(active))
+    if n_active == 0:
+        return
+
+    workers = _worker_count()
+    if n_active < _PARALLEL_MIN_MEMBERS or workers < 2:
+        _member_kernel_rows(tables, _active_rows(active), u, out_U, out_F, out_D)
+        return
+
+    # Large frames: numpy releases the GIL inside matmul/einsum, so disjoint
+    # shards of members run concurrently and write disjoint output rows
+    shards = np.array_split(np.flatnonzero(active), workers)
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        for future in [
+            executor.submit(_member_kernel_rows, tables, rows, u, out_U, out_F, out_D)
+            for rows in shards
+        ]:
+            future.result()
+
+
+def _member_kernel_rows(
+    tables: _MemberTables,
+    idx: np.ndarray | slice,
+    u: np.ndarray,
+    out_U: np.ndarray,
+    out_F: np.ndarray,
+    out_D: np.ndarray
+) -> None:
+    """
+    Run the _member_kernel computation for the member rows selected by idx.
 
-    Returns:
-        MemberState with strain energy, axial force, deformation, failed flag.
-    """
-    if member.failed:
-        return MemberState(
-            member_id=member.id,
-            strain_energy=0.0,
-            axial_force=0.0,
-            deformation=0.0,
-            failed=True
-        )
+    Args:
+        tables: Per-member arrays from _member_tables.
+        idx: Member positions, or a slice from _active_rows.
+        u: Global displacement vector.
+        out_U, out_F, out_D: Output arrays, written in place at idx.
+    """
+    # (n_rows, 12) block of global DOFs in one gather
+    u_global = u[tables.dof_idx[idx]]
 
-    # Extract 12 global DOFs (6 per node)
-    i = member.node_start * 6
-    j = member.node_end   * 6
-    u_global = np.concatenate([u[i:i+6], u[j:j+6]])
-
-    # Transform to local coordinates
-    T       = _transformation_matrix(member, frame)
-    k_local = _local_stiffness(member, frame)
-    u_local = T @ u_global
-
-    # Internal force vector in local coordinates
-    f_local = k_local @ u_local
-
-    # Strain energy from full deformation (axial + bending)
-    strain_energy = float(0.5 * u_local @ f_local)
-
-    # Axial force: local DOF 0 (positive = tension, negative = compression)
-    axial_force = float(f_local[0])
-
-    # Axial deformation along member axis
-    n_start = _get_node(frame, member.node_start)
-    n_end   = _get_node(frame, member.node_end)
-    L       = _member_length(member, frame)
-    axis    = np.array([
-        n_end.x - n_start.x,
-        n_end.y - n_start.y,
-        n_end.z - n_start.z
-    ]) / L
-    deformation = float(np.dot(u_global[3:6] - u_global[0:3], axis))
-
-    return MemberState(
-        member_id=member.id,
-        strain_energy=max(strain_energy, 0.0),
-        axial_force=axial_force,
-        deformation=deformation,
-        failed=False
-    )
\ No newline at end of file
+    f_global = np.matmul(tables.kg_all[idx], u_global[:, :, None])[:, :, 0]
+
+    out_U[idx] = np.maximum(0.5 * np.einsum("mi,mi->m", u_global, f_global), 0.0)
+    out_F[idx] = np.einsum("mi,mi->m", tables.force_rows[idx, 0], u_global)
+    out_D[idx] = np.einsum("mi,mi->m", u_global[:, 3:6] - u_global[:, 0:3], tables.axis_all[idx])
+
+
+def _worker_count() -> int:
+    """Number of threads for the sharded member kernel (CPU count, at least 1)."""
+    return os.cpu_count() or 1
+
+
+def _active_rows(active: np.ndarray) -> np.ndarray | slice:
+    """
+    Return an index selecting the active rows of the member tables.
+
+    Before any failure every member is active; a full slice then makes
+    tables.kg_all[rows] and friends views instead of fancy-index copies of
+    the (M, 12, 12) stacks on every step.
+
+    Args:
+        active: True for non-failed members, shape (M,).
+
+    Returns:
+        slice(None) if all members are active, else their positions.
+    """
+    if active.all():
+        return slice(None)
+    return np.flatnonzero(active)
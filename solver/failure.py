@@ -22,10 +22,8 @@ Consumed by simulation/runner.py after each equilibrium solve.
 """
 
 import numpy as np
-from core.models import FrameData, EnergyState
-from structure.stiffness import _local_stiffness, _transformation_matrix
-from structure.stiffness import assemble_global_stiffness, apply_boundary_conditions
-from solver.equilibrium import _build_load_vector, apply_boundary_conditions_to_force, _solve_system
+from core.models import FrameData, EnergyState, MemberResponse
+from solver.equilibrium import member_response
 
 
 def check_and_apply_failures(
@@ -36,8 +34,11 @@ def check_and_apply_failures(
     """
     Check all members for failure and mark them in the frame.
 
-    Re-solves for the displacement vector to extract full internal force
-    vectors, then checks combined axial + bending stress against sigma_y.
+    Reuses the displacement vector solve() cached for the current failure
+    state and load factor (or solves with the cached factorization if
+    called on its own) through member_response, which recovers the axial
+    force and end moments of all active members in one batched pass, then
+    checks combined axial + bending stress against sigma_y.
 
     Args:
         frame: Frame definition (modified in-place — failed flags updated).
@@ -48,32 +49,23 @@ def check_and_apply_failures(
     Returns:
         List of member IDs that newly failed this step.
     """
-    # Re-solve at the current load level
-    K = assemble_global_stiffness(frame)
-    K = apply_boundary_conditions(K, frame)
-    F = _build_load_vector(frame, load_factor=load_factor)
-    F = apply_boundary_conditions_to_force(F, frame)
-    u = _solve_system(K, F)
+    # End forces at the current load level (u cached by solve())
+    response = member_response(frame, load_factor, energy_state.failed)
 
-    newly_failed = []
+    # Only members still active in this state are checked, all at once
+    idx = np.flatnonzero(~energy_state.failed)
+    sigma_max = _combined_stresses(response, idx)
 
-    for ms in energy_state.member_states:
-        if ms.failed:
-            continue
+    hit = idx[sigma_max >= response.sigma_y[idx]]
+    members = frame.members
+    for i in hit.tolist():
+        members[i].failed = True
+    return response.member_ids[hit].tolist()
 
-        member = _get_member(frame, ms.member_id)
-        sigma_max = _combined_stress(member, u, frame)
 
-        if sigma_max >= member.sigma_y:
-            member.failed = True
-            newly_failed.append(member.id)
-
-    return newly_failed
-
-
-def _combined_stress(member, u: np.ndarray, frame: FrameData) -> float:
+def _combined_stresses(response: MemberResponse, idx: np.ndarray) -> np.ndarray:
     """
-    Compute maximum combined axial + bending stress in a member.
+    Compute maximum combined axial + bending stress for a set of members.
 
     Extracts the full internal force vector in local coordinates and
     computes:
@@ -84,49 +76,33 @@ def _combined_stress(member, u: np.ndarray, frame: FrameData) -> float:
     where c = sqrt(I/A) approximates the distance from neutral axis
     to extreme fiber for a compact section.
 
+    Batched over the members in idx from the end forces the solver
+    recovers in one pass, so there is no per-member Python work.
+
     Args:
-        member: Member with material properties.
-        u: Global displacement vector.
-        frame: Frame geometry.
+        response: Section properties and end forces from
+                  solver.equilibrium.member_response, with a load factor.
+        idx: Positions (in frame.members order) of the members to check.
 
     Returns:
-        Maximum combined stress in Pa.
+        Maximum combined stress in Pa per member selected by idx.
     """
-    i = member.node_start * 6
-    j = member.node_end   * 6
-    u_global = np.concatenate([u[i:i+6], u[j:j+6]])
-
-    T       = _transformation_matrix(member, frame)
-    k_local = _local_stiffness(member, frame)
-    u_local = T @ u_global
-    f_local = k_local @ u_local
+    N = response.axial_force[idx]
+    M_start, M_end = response.end_moments[idx].T
 
-    A, I = member.A, member.I
+    A, I = response.area[idx], response.inertia[idx]
     c = np.sqrt(I / A)  # Approximate extreme fiber distance
 
     # Axial stress from local DOF 0
-    sigma_axial = abs(f_local[0]) / A
+    sigma_axial = np.abs(N) / A
 
     # Bending moment at start (DOF 5) and end (DOF 11)
-    M_max = max(abs(f_local[5]), abs(f_local[11]))
+    M_max = np.maximum(np.abs(M_start), np.abs(M_end))
     sigma_bending = M_max * c / I
 
     return sigma_axial + sigma_bending
 
 
-def _get_member(frame: FrameData, member_id: int):
-    """
-    Retrieve a member by ID from the frame.
-
-    Raises:
-        ValueError: If member_id is not found.
-    """
-    for member in frame.members:
-        if member.id == member_id:
-            return member
-    raise ValueError(f"Member {member_id} not found in frame.")
-
-
 def all_failed(frame: FrameData) -> bool:
     """
     Check if all members in the frame have failed.
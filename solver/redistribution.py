@@ -17,14 +17,21 @@ Consumed by simulation/runner.py immediately after a failure event.
 """
 
 import numpy as np
-from core.models import FrameData, EnergyState, MemberState
+import scipy.sparse as sp
+from core.models import FrameData, EnergyState
+from solver.equilibrium import member_response
+
+
+# Relative L-infinity size of dU below which redistribute() is a no-op
+_DU_TOL = 1e-12
 
 
 def redistribute(frame: FrameData, energy_state: EnergyState, dt: float = 1.0) -> EnergyState:
     """
     Perform one redistribution step after a failure event.
 
-    Builds the coupling matrix alpha from frame topology, then advances
+    Takes the coupling matrix alpha for the current failure state (built
+    from frame topology and cached until the next failure), then advances
     the energy state by dt using forward Euler integration.
 
     Args:
@@ -33,128 +40,135 @@ def redistribute(frame: FrameData, energy_state: EnergyState, dt: float = 1.0) -
         dt: Integration time step. Default 1.0 (normalized pseudo-time).
 
     Returns:
-        Updated EnergyState with redistributed strain energies.
+        Updated EnergyState with redistributed strain energies, or
+        energy_state itself if the step would change no energy by more
+        than _DU_TOL relative to the largest one.
     """
-    active = [ms for ms in energy_state.member_states if not ms.failed]
-    ids = [ms.member_id for ms in active]
-    U = np.array([ms.strain_energy for ms in active], dtype=float)
-
-    alpha = _build_coupling_matrix(frame, ids)
-    dU = alpha @ U - np.diag(alpha.sum(axis=1)) @ U
-    U_new = np.clip(U + dt * dU, 0.0, None)  # Energy cannot go negative
-
-    updated_map = dict(zip(ids, U_new))
-
-    new_member_states = []
-    for ms in energy_state.member_states:
-        if ms.member_id in updated_map:
-            new_member_states.append(MemberState(
-                member_id=ms.member_id,
-                strain_energy=updated_map[ms.member_id],
-                axial_force=ms.axial_force,
-                deformation=ms.deformation,
-                failed=ms.failed
-            ))
-        else:
-            new_member_states.append(ms)  # Failed member, unchanged
-
-    total_energy = sum(ms.strain_energy for ms in new_member_states)
+    active = ~energy_state.failed
+    ids = energy_state.member_ids[active].tolist()
+    U = energy_state.strain_energy[active]
+
+    alpha, alpha_rowsum = _coupling(frame, active, ids)
+    # Row sums scale U elementwise; no (n, n) diagonal matrix is needed
+    dU = alpha @ U - alpha_rowsum * U
+
+    # Already in equilibrium (e.g. uniform energies across coupled members):
+    # the Euler step would not change anything measurable
+    if U.size == 0 or np.max(np.abs(dU)) < _DU_TOL * max(U.max(), 1.0):
+        return energy_state
+
+    U_new = U + dt * dU
+    np.maximum(U_new, 0.0, out=U_new)  # Energy cannot go negative
+
+    # Failed members keep their (zero) energy unchanged
+    strain_energy = energy_state.strain_energy.copy()
+    strain_energy[active] = U_new
 
     return EnergyState(
         step=energy_state.step,
-        total_energy=total_energy,
-        member_states=new_member_states
+        total_energy=float(strain_energy.sum()),
+        member_ids=energy_state.member_ids,
+        strain_energy=strain_energy,
+        axial_force=energy_state.axial_force,
+        deformation=energy_state.deformation,
+        failed=energy_state.failed,
     )
 
 
-def _build_coupling_matrix(frame: FrameData, active_ids: list[int]) -> np.ndarray:
+def _coupling(frame: FrameData, active: np.ndarray, active_ids: list[int]) -> tuple:
     """
-    Build the coupling coefficient matrix alpha for active members.
+    Return the coupling matrix and its row sums for the active members.
 
-    Two members are coupled if they share a node. The coupling strength
-    alpha_ij is proportional to the harmonic mean of their axial stiffnesses
-    (EA/L), normalized so that stiffer paths attract more energy.
+    Cached in frame._cache keyed by the active mask: alpha depends only on
+    which members survive, so it is rebuilt once per failure event rather
+    than on every redistribution call.
 
     Args:
         frame: Frame definition for topology and member properties.
-        active_ids: IDs of non-failed members to include.
+        active: True for non-failed members, shape (M,).
+        active_ids: IDs of the active members, in mask order.
 
     Returns:
-        alpha (np.ndarray): Square coupling matrix of shape (n, n).
-                            alpha[i, j] > 0 if members i and j share a node.
-                            Diagonal is zero (no self-coupling).
+        (alpha, row_sums): sparse coupling matrix from _build_coupling_matrix
+        and alpha.sum(axis=1) as a flat array.
     """
-    n = len(active_ids)
-    alpha = np.zeros((n, n))
-    idx = {mid: i for i, mid in enumerate(active_ids)}
-
-    active_members = [m for m in frame.members if m.id in idx]
+    signature = active.tobytes()
+    cached = frame._cache.get("coupling")
+    if cached is not None and cached[0] == signature:
+        return cached[1]
 
-    # Build node -> member adjacency
-    node_members: dict[int, list] = {}
-    for m in active_members:
-        for node_id in (m.node_start, m.node_end):
-            node_members.setdefault(node_id, []).append(m)
+    alpha = _build_coupling_matrix(frame, active_ids)
+    coupling = (alpha, np.asarray(alpha.sum(axis=1)).ravel())
+    frame._cache["coupling"] = (signature, coupling)
+    return coupling
 
-    # Fill coupling coefficients for members sharing a node
-    for members_at_node in node_members.values():
-        for m_i in members_at_node:
-            for m_j in members_at_node:
-                if m_i.id == m_j.id:
-                    continue
-                i, j = idx[m_i.id], idx[m_j.id]
-                k_i = _axial_stiffness(m_i, frame)
-                k_j = _axial_stiffness(m_j, frame)
-                alpha[i, j] += _harmonic_mean(k_i, k_j)
 
-    return alpha
+def _build_coupling_matrix(frame: FrameData, active_ids: list[int]) -> sp.csr_matrix:
+    """
+    Build the coupling coefficient matrix alpha for active members.
 
+    Two members are coupled if they share a node. The coupling strength
+    alpha_ij is proportional to the harmonic mean of their axial stiffnesses
+    (EA/L), normalized so that stiffer paths attract more energy. EA/L is
+    read from solver.equilibrium.member_response (cached per frame)
+    rather than recomputed from node coordinates.
 
-def _axial_stiffness(member, frame: FrameData) -> float:
-    """
-    Compute axial stiffness EA/L for a member.
+    Each member only touches the few others at its two nodes, so alpha is
+    assembled sparse from (i, j) pairs: O(n) nonzeros instead of an (n, n)
+    dense buffer, and alpha @ U costs O(nnz).
 
     Args:
-        member: Member with E, A properties.
-        frame: Used to compute member length from node coordinates.
+        frame: Frame definition for topology and member properties.
+        active_ids: IDs of non-failed members to include.
 
     Returns:
-        Axial stiffness in N/m.
+        alpha (sp.csr_matrix): Square coupling matrix of shape (n, n).
+                               alpha[i, j] > 0 if members i and j share a node.
+                               Diagonal is zero (no self-coupling).
     """
-    n_start = _get_node(frame, member.node_start)
-    n_end = _get_node(frame, member.node_end)
-    L = np.sqrt(
-        (n_end.x - n_start.x)**2 +
-        (n_end.y - n_start.y)**2 +
-        (n_end.z - n_start.z)**2
-    )
-    return member.E * member.A / L
+    n = len(active_ids)
+    idx = {mid: i for i, mid in enumerate(active_ids)}
+    k = np.zeros(n)
+    k_axial = member_response(frame).axial_stiffness  # EA/L, no solve
+
+    # Build node -> member adjacency (positions in active_ids)
+    node_members: dict[int, list[int]] = {}
+    for pos, m in enumerate(frame.members):
+        i = idx.get(m.id)
+        if i is None:
+            continue
+        k[i] = k_axial[pos]
+        for node_id in (m.node_start, m.node_end):
+            node_members.setdefault(node_id, []).append(i)
 
+    # Coupling pairs for members sharing a node
+    rows, cols = [], []
+    for members_at_node in node_members.values():
+        for i in members_at_node:
+            for j in members_at_node:
+                if i != j:
+                    rows.append(i)
+                    cols.append(j)
 
-def _harmonic_mean(a: float, b: float) -> float:
-    """
-    Compute harmonic mean of two stiffness values.
-    Returns 0 if either value is zero to avoid division errors.
+    rows = np.array(rows, dtype=int)
+    cols = np.array(cols, dtype=int)
+    values = _harmonic_mean(k[rows], k[cols])
+    return sp.coo_matrix((values, (rows, cols)), shape=(n, n)).tocsr()
 
-    Args:
-        a, b: Stiffness values.
 
-    Returns:
-        Harmonic mean, or 0.0 if inputs are invalid.
+def _harmonic_mean(a: np.ndarray, b: np.ndarray) -> np.ndarray:
     """
-    if a == 0 or b == 0:
-        return 0.0
-    return 2 * a * b / (a + b)
+    Compute the elementwise harmonic mean of two arrays of stiffness values.
+    Returns 0 where either value is zero to avoid division errors.
 
+    Args:
+        a, b: Stiffness values, same shape.
 
-def _get_node(frame: FrameData, node_id: int):
+    Returns:
+        Harmonic means, 0.0 where inputs are invalid.
     """
-    Retrieve a node by ID from the frame.
+    out = np.zeros_like(a)
+    valid = (a != 0) & (b != 0)
+    out[valid] = 2 * a[valid] * b[valid] / (a[valid] + b[valid])
+    return out
 
-    Raises:
-        ValueError: If node_id is not found.
-    """
-    for node in frame.nodes:
-        if node.id == node_id:
-            return node
-    raise ValueError(f"Node {node_id} not found in frame.")
\ No newline at end of file
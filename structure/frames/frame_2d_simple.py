@@ -31,9 +31,9 @@ def build() -> FrameData:
     """
     return FrameData(
         name="2D Simple Truss",
-        nodes=_define_nodes(),
-        members=_define_members(),
-        loads=_define_loads()
+        nodes=[Node(i, x, y, z, list(dofs)) for i, x, y, z, dofs in _NODE_SPECS],
+        members=[Member(*spec) for spec in _MEMBER_SPECS],
+        loads=list(_LOADS)
     )
 
 
@@ -75,4 +75,13 @@ def _define_loads() -> list[Load]:
     """
     return [
         Load(node_id=1, dof=1, magnitude=-50_000.0)
-    ]
\ No newline at end of file
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Geometry evaluated once at import
+# ---------------------------------------------------------------------------
+
+_NODE_SPECS = tuple((n.id, n.x, n.y, n.z, tuple(n.fixed_dofs)) for n in _define_nodes())
+_LOADS = tuple(_define_loads())
+_MEMBER_SPECS = tuple((m.id, m.node_start, m.node_end, m.material) for m in _define_members())
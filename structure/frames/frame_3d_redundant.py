@@ -39,9 +39,9 @@ def build() -> FrameData:
     """
     return FrameData(
         name="3D Redundant Space Frame",
-        nodes=_define_nodes(),
-        members=_define_members(),
-        loads=_define_loads()
+        nodes=[Node(i, x, y, z, list(dofs)) for i, x, y, z, dofs in _NODE_SPECS],
+        members=[Member(*spec) for spec in _MEMBER_SPECS],
+        loads=list(_LOADS)
     )
 
 
@@ -93,4 +93,13 @@ def _define_loads() -> list[Load]:
     """
     return [
         Load(node_id=4, dof=2, magnitude=-200_000.0)
-    ]
\ No newline at end of file
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Geometry evaluated once at import
+# ---------------------------------------------------------------------------
+
+_NODE_SPECS = tuple((n.id, n.x, n.y, n.z, tuple(n.fixed_dofs)) for n in _define_nodes())
+_LOADS = tuple(_define_loads())
+_MEMBER_SPECS = tuple((m.id, m.node_start, m.node_end, m.material) for m in _define_members())
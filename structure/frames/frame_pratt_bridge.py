@@ -95,9 +95,9 @@ def build() -> FrameData:
     """
     return FrameData(
         name="Pratt Truss Bridge (6-panel, 30m span)",
-        nodes=_define_nodes(),
-        members=_define_members(),
-        loads=_define_loads()
+        nodes=[Node(i, x, y, z, list(dofs)) for i, x, y, z, dofs in _NODE_SPECS],
+        members=[Member(*spec) for spec in _MEMBER_SPECS],
+        loads=list(_LOADS)
     )
 
 
@@ -212,4 +212,13 @@ def _define_loads() -> list[Load]:
         else:
             magnitude = -100_000.0  # Full panel load at interior nodes
         loads.append(Load(node_id=i, dof=1, magnitude=magnitude))
-    return loads
\ No newline at end of file
+    return loads
+
+
+# ---------------------------------------------------------------------------
+# Geometry evaluated once at import
+# ---------------------------------------------------------------------------
+
+_NODE_SPECS = tuple((n.id, n.x, n.y, n.z, tuple(n.fixed_dofs)) for n in _define_nodes())
+_LOADS = tuple(_define_loads())
+_MEMBER_SPECS = tuple((m.id, m.node_start, m.node_end, m.material) for m in _define_members())
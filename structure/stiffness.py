@@ -6,8 +6,39 @@ Supports 2D and 3D Euler-Bernoulli beam elements.
 Output is consumed by solver/equilibrium.py.
 """
 
+import math
+from dataclasses import dataclass
+
 import numpy as np
-from core.models import FrameData, Member, Node
+import scipy.sparse as sp
+from core.models import FrameData, Member
+
+
+@dataclass(frozen=True)
+class ElementMatrices:
+    """
+    Per-member geometry and stiffness for every member of a frame.
+
+    Attributes:
+        L (np.ndarray): Member lengths, shape (M,).
+        axis (np.ndarray): Unit member axes, shape (M, 3).
+        k_global (np.ndarray): T^T k T per member, shape (M, 12, 12).
+        kT (np.ndarray): k T per member (local end forces from global
+                         displacements), shape (M, 12, 12).
+    """
+    L: np.ndarray
+    axis: np.ndarray
+    k_global: np.ndarray
+    kT: np.ndarray
+
+
+# Reference vectors for local y/z, in order of preference (see _transformation_matrix)
+_REF_VECTORS = (
+    np.array([0.0, 1.0, 0.0]),
+    np.array([0.0, 0.0, 1.0]),
+    np.array([1.0, 0.0, 0.0]),
+)
+_BLOCKS = np.arange(4)
 
 
 def assemble_global_stiffness(frame: FrameData) -> np.ndarray:
@@ -15,7 +46,9 @@ def assemble_global_stiffness(frame: FrameData) -> np.ndarray:
     Build the global stiffness matrix K for the entire frame.
 
     Iterates over all non-failed members, computes their local stiffness,
-    transforms to global coordinates, and assembles into K.
+    transforms to global coordinates, and assembles into K. Dense view of
+    assemble_global_stiffness_sparse, which scatters each 12x12 block as
+    COO triplets instead of 144 Python-level element updates.
 
     Args:
         frame: Full frame definition including nodes and members.
@@ -23,21 +56,37 @@ def assemble_global_stiffness(frame: FrameData) -> np.ndarray:
     Returns:
         K (np.ndarray): Global stiffness matrix of shape (n_dof, n_dof).
     """
+    return assemble_global_stiffness_sparse(frame).toarray()
+
+
+def assemble_global_stiffness_sparse(frame: FrameData) -> sp.csr_matrix:
+    """
+    Build the global stiffness matrix K as a sparse CSR matrix.
+
+    Each non-failed member's 12x12 global block is emitted as
+    (row, col, value) triplets and duplicates are summed when converting
+    COO to CSR. K holds only O(n) nonzeros per row, so this avoids the
+    dense (n_dof, n_dof) buffer. The element matrices come from
+    _element_matrices, which builds them for all members once per frame.
+
+    Args:
+        frame: Full frame definition including nodes and members.
+
+    Returns:
+        K (sp.csr_matrix): Global stiffness matrix of shape (n_dof, n_dof).
+    """
     n_dof = len(frame.nodes) * 6
-    K = np.zeros((n_dof, n_dof))
-
-    for member in frame.members:
-        if member.failed:
-            continue
-        k_local = _local_stiffness(member, frame)
-        T = _transformation_matrix(member, frame)
-        k_global = T.T @ k_local @ T
-        dofs = _member_dofs(member)
-        for i, gi in enumerate(dofs):
-            for j, gj in enumerate(dofs):
-                K[gi, gj] += k_global[i, j]
+    active = np.fromiter((not m.failed for m in frame.members), dtype=bool, count=len(frame.members))
+    if not active.any():
+        return sp.csr_matrix((n_dof, n_dof))
 
-    return K
+    # Element matrices are built once per frame; failures only select rows
+    k_global = _element_matrices(frame).k_global[active]
+    dofs = frame.arrays().member_dofs[active]
+    return sp.coo_matrix(
+        (k_global.ravel(), (np.repeat(dofs, 12, axis=1).ravel(), np.tile(dofs, (1, 12)).ravel())),
+        shape=(n_dof, n_dof)
+    ).tocsr()
 
 
 def apply_boundary_conditions(K: np.ndarray, frame: FrameData) -> np.ndarray:
@@ -52,16 +101,14 @@ def apply_boundary_conditions(K: np.ndarray, frame: FrameData) -> np.ndarray:
     Returns:
         K (np.ndarray): Modified stiffness matrix.
     """
-    for node in frame.nodes:
-        for dof in node.fixed_dofs:
-            global_dof = node.id * 6 + dof
-            K[global_dof, :] = 0
-            K[:, global_dof] = 0
-            K[global_dof, global_dof] = 1
+    fixed = _fixed_dofs(frame)
+    K[fixed, :] = 0
+    K[:, fixed] = 0
+    K[fixed, fixed] = 1
     return K
 
 
-def _local_stiffness(member: Member, frame: FrameData) -> np.ndarray:
+def _local_stiffness(member: Member, frame: FrameData, L: float | None = None) -> np.ndarray:
     """
     Compute the 12x12 local stiffness matrix for an Euler-Bernoulli beam element.
 
@@ -73,29 +120,16 @@ def _local_stiffness(member: Member, frame: FrameData) -> np.ndarray:
     Args:
         member: Member with material and section properties.
         frame: Used to retrieve node coordinates for length calculation.
+        L: Member length, if already known (skips the node lookups).
 
     Returns:
         k_local (np.ndarray): 12x12 local stiffness matrix.
     """
-    L = _member_length(member, frame)
-    E, A, I = member.E, member.A, member.I
-    k_local = np.zeros((12, 12))
-
-    # Axial terms (DOFs 0, 6)
-    k_local[0, 0] = k_local[6, 6] =  E * A / L
-    k_local[0, 6] = k_local[6, 0] = -E * A / L
-
-    # Bending in local XY plane — strong axis (DOFs 1, 5, 7, 11)
-    k_local[1, 1]  = k_local[7, 7]  =  12 * E * I / L**3
-    k_local[1, 7]  = k_local[7, 1]  = -12 * E * I / L**3
-    k_local[1, 5]  = k_local[5, 1]  =   6 * E * I / L**2
-    k_local[1, 11] = k_local[11, 1] =   6 * E * I / L**2
-    k_local[7, 5]  = k_local[5, 7]  =  -6 * E * I / L**2
-    k_local[7, 11] = k_local[11, 7] =  -6 * E * I / L**2
-    k_local[5, 5]  = k_local[11, 11] =  4 * E * I / L
-    k_local[5, 11] = k_local[11, 5]  =  2 * E * I / L
-
-    return k_local
+    if L is None:
+        L = _member_length(member, frame)
+    return _local_stiffness_batch(
+        np.array([member.E]), np.array([member.A]), np.array([member.I]), np.array([L])
+    )[0]
 
 
 def _transformation_matrix(member: Member, frame: FrameData) -> np.ndarray:
@@ -126,65 +160,211 @@ def _transformation_matrix(member: Member, frame: FrameData) -> np.ndarray:
     Returns:
         T (np.ndarray): 12x12 transformation matrix.
     """
-    n_start = _get_node(frame, member.node_start)
-    n_end   = _get_node(frame, member.node_end)
-
-    dx = n_end.x - n_start.x
-    dy = n_end.y - n_start.y
-    dz = n_end.z - n_start.z
-    L  = np.sqrt(dx**2 + dy**2 + dz**2)
-
-    local_x = np.array([dx, dy, dz]) / L
-
-    # Choose reference vector that is not collinear with local_x
-    # to ensure a well-defined cross product.
-    candidates = [
-        np.array([0.0, 1.0, 0.0]),  # Global Y — preferred for most members
-        np.array([0.0, 0.0, 1.0]),  # Global Z — fallback
-        np.array([1.0, 0.0, 0.0]),  # Global X — last resort
-    ]
-    for ref in candidates:
-        cross = np.cross(local_x, ref)
-        if np.linalg.norm(cross) > 1e-6:
-            local_z = cross / np.linalg.norm(cross)
+    coords = frame.arrays().node_xyz
+    _, local_x = _member_geometry(
+        coords, np.array([member.node_start]), np.array([member.node_end])
+    )
+    return _transformation_batch(local_x)[0]
+
+
+def _local_stiffness_batch(
+    E: np.ndarray, A: np.ndarray, I: np.ndarray, L: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the 12x12 local stiffness matrices of many members at once.
+
+    The E*A/L and E*I/L**n coefficients are computed once per member and
+    written to their 16 positions with whole-column assignments.
+
+    Args:
+        E, A, I: Material and section properties per member, shape (M,).
+        L: Member lengths, shape (M,).
+
+    Returns:
+        k_local (np.ndarray): Local stiffness matrices, shape (M, 12, 12).
+    """
+    EAL  = E * A / L
+    EIL  = E * I / L
+    EIL2 = EIL / L
+    EIL3 = EIL2 / L
+    k_local = np.zeros((len(L), 12, 12))
+
+    # Axial terms (DOFs 0, 6)
+    k_local[:, 0, 0] = k_local[:, 6, 6] =  EAL
+    k_local[:, 0, 6] = k_local[:, 6, 0] = -EAL
+
+    # Bending in local XY plane — strong axis (DOFs 1, 5, 7, 11)
+    k_local[:, 1, 1]  = k_local[:, 7, 7]  =  12 * EIL3
+    k_local[:, 1, 7]  = k_local[:, 7, 1]  = -12 * EIL3
+    k_local[:, 1, 5]  = k_local[:, 5, 1]  =   6 * EIL2
+    k_local[:, 1, 11] = k_local[:, 11, 1] =   6 * EIL2
+    k_local[:, 7, 5]  = k_local[:, 5, 7]  =  -6 * EIL2
+    k_local[:, 7, 11] = k_local[:, 11, 7] =  -6 * EIL2
+    k_local[:, 5, 5]  = k_local[:, 11, 11] =  4 * EIL
+    k_local[:, 5, 11] = k_local[:, 11, 5]  =  2 * EIL
+
+    return k_local
+
+
+def _transformation_batch(local_x: np.ndarray) -> np.ndarray:
+    """
+    Stacked _transformation_matrix for many members at once.
+
+    Applies the same reference vector selection per member: the first
+    candidate (global Y, Z, then X) not collinear with local x.
+
+    Args:
+        local_x: Unit member axes, shape (M, 3).
+
+    Returns:
+        T (np.ndarray): Transformation matrices, shape (M, 12, 12).
+    """
+    M = len(local_x)
+
+    # Global Y for every member, then Z and X only where still collinear
+    local_z = _cross3(local_x, _REF_VECTORS[0])
+    norm = _norm3(local_z)
+    for ref in _REF_VECTORS[1:]:
+        bad = np.flatnonzero(norm <= 1e-6)
+        if bad.size == 0:
             break
+        local_z[bad] = _cross3(local_x[bad], ref)
+        norm[bad] = _norm3(local_z[bad])
+    local_z /= norm[:, None]
 
-    local_y = np.cross(local_z, local_x)
-    local_y /= np.linalg.norm(local_y)
+    local_y = _cross3(local_z, local_x)
+    local_y /= _norm3(local_y)[:, None]
 
-    # 3x3 rotation matrix: rows are local axes expressed in global coords
-    R = np.array([local_x, local_y, local_z])
+    # (M, 3, 3) rotations: rows are local axes expressed in global coords
+    R = np.stack([local_x, local_y, local_z], axis=1)
 
-    # Expand to 12x12 (4 blocks of 3x3 — one per node DOF group)
-    T = np.zeros((12, 12))
-    for i in range(4):
-        T[i*3:(i+1)*3, i*3:(i+1)*3] = R
+    # Place R in the four diagonal 3x3 blocks in one strided write
+    T = np.zeros((M, 4, 3, 4, 3))
+    T[:, _BLOCKS, :, _BLOCKS, :] = R  # advanced indices first: (4, M, 3, 3)
+    return T.reshape(M, 12, 12)
 
-    return T
 
+def _cross3(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Row-wise cross product of (M, 3) arrays (b may be a single 3-vector).
 
-def _member_length(member: Member, frame: FrameData) -> float:
-    """Compute Euclidean length of a member from its two node coordinates."""
-    n_start = _get_node(frame, member.node_start)
-    n_end   = _get_node(frame, member.node_end)
-    return float(np.sqrt(
-        (n_end.x - n_start.x)**2 +
-        (n_end.y - n_start.y)**2 +
-        (n_end.z - n_start.z)**2
-    ))
-
-
-def _member_dofs(member: Member) -> list:
-    """Return the 12 global DOF indices for a member's two nodes (6 DOFs each)."""
-    return (
-        list(range(member.node_start * 6, member.node_start * 6 + 6)) +
-        list(range(member.node_end   * 6, member.node_end   * 6 + 6))
+    Written out on columns: np.cross goes through its generic broadcasting
+    machinery, which costs more than the six multiplies it performs.
+    """
+    ax, ay, az = a[:, 0], a[:, 1], a[:, 2]
+    bx, by, bz = b[..., 0], b[..., 1], b[..., 2]
+    out = np.empty(a.shape)
+    out[:, 0] = ay * bz - az * by
+    out[:, 1] = az * bx - ax * bz
+    out[:, 2] = ax * by - ay * bx
+    return out
+
+
+def _norm3(a: np.ndarray) -> np.ndarray:
+    """Row-wise Euclidean norm of an (M, 3) array."""
+    return np.sqrt(a[:, 0]**2 + a[:, 1]**2 + a[:, 2]**2)
+
+
+def _element_matrices(frame: FrameData) -> ElementMatrices:
+    """
+    Return the geometry and element matrices of all members of a frame.
+
+    E, A, I and L do not change when members fail, so the matrices are
+    built once in whole-array passes and cached in frame._cache; every
+    later assembly (after each failure) only selects the active rows.
+
+    Args:
+        frame: Full frame definition including nodes and members.
+
+    Returns:
+        ElementMatrices for frame.members, read-only.
+    """
+    cached = frame._cache.get("elements")
+    if cached is None:
+        arrays = frame.arrays()
+        starts, ends = arrays.member_conn.T
+        L, axis = _member_geometry(arrays.node_xyz, starts, ends)
+        E, A, I = arrays.member_EAI.T
+        k_global, kT = _element_matrices_batch(frame.element_type, E, A, I, L, axis)
+        for a in (L, axis, k_global, kT):
+            a.flags.writeable = False
+        cached = frame._cache["elements"] = ElementMatrices(L, axis, k_global, kT)
+    return cached
+
+
+def _element_matrices_batch(
+    element_type: str, E: np.ndarray, A: np.ndarray, I: np.ndarray,
+    L: np.ndarray, local_x: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Build global element stiffness matrices for many members at once.
+
+    "beam" uses the full Euler-Bernoulli k_local and T. "truss" keeps only
+    the axial EA/L terms, so k T and T^T k T are written directly from the
+    direction cosines (two nonzero rows of k T, four 3x3 blocks of K)
+    without building T or any 12x12 products.
+
+    Args:
+        element_type: FrameData.element_type, "beam" or "truss".
+        E, A, I: Material and section properties per member, shape (M,).
+        L: Member lengths, shape (M,).
+        local_x: Unit member axes, shape (M, 3).
+
+    Returns:
+        (k_global, kT): T^T k T and k T per member, both shape (M, 12, 12).
+
+    Raises:
+        ValueError: If element_type is not "beam" or "truss".
+    """
+    if element_type == "beam":
+        T = _transformation_batch(local_x)
+        kT = np.matmul(_local_stiffness_batch(E, A, I, L), T)
+        return np.matmul(T.transpose(0, 2, 1), kT), kT
+    if element_type != "truss":
+        raise ValueError(f"Unknown element_type {element_type!r}; expected 'beam' or 'truss'.")
+
+    M = len(L)
+    axial = (E * A / L)[:, None] * local_x
+    kT = np.zeros((M, 12, 12))
+    kT[:, 0, 0:3] = axial
+    kT[:, 0, 6:9] = -axial
+    kT[:, 6] = -kT[:, 0]
+
+    P = axial[:, :, None] * local_x[:, None, :]   # EA/L * outer(x, x)
+    k_global = np.zeros((M, 12, 12))
+    k_global[:, 0:3, 0:3] = k_global[:, 6:9, 6:9] = P
+    k_global[:, 0:3, 6:9] = k_global[:, 6:9, 0:3] = -P
+    return k_global, kT
+
+
+def _member_geometry(
+    coords: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute member lengths and unit axes from node coordinates.
+
+    Args:
+        coords: Node coordinates, shape (N, 3), row i holding node ID i.
+        starts, ends: Start and end node IDs per member, shape (M,).
+
+    Returns:
+        (L, axis): lengths, shape (M,), and unit axes, shape (M, 3).
+    """
+    delta = coords[ends] - coords[starts]
+    L = np.sqrt(delta[:, 0]**2 + delta[:, 1]**2 + delta[:, 2]**2)
+    return L, delta / L[:, None]
+
+
+def _fixed_dofs(frame: FrameData) -> np.ndarray:
+    """Return the global indices of all constrained DOFs as an int array."""
+    return np.array(
+        [node.id * 6 + dof for node in frame.nodes for dof in node.fixed_dofs],
+        dtype=np.int64
     )
 
 
-def _get_node(frame: FrameData, node_id: int) -> Node:
-    """Retrieve a node by ID from the frame. Raises ValueError if not found."""
-    for node in frame.nodes:
-        if node.id == node_id:
-            return node
-    raise ValueError(f"Node {node_id} not found in frame.")
\ No newline at end of file
+def _member_length(member: Member, frame: FrameData) -> float:
+    """Compute Euclidean length of a member from its two node coordinates."""
+    xyz = frame.arrays().node_xyz
+    dx, dy, dz = (xyz[member.node_end] - xyz[member.node_start]).tolist()
+    return math.hypot(dx, dy, dz)
@@ -0,0 +1,17 @@
+"""
+tests/conftest.py
+=================
+Shared pytest setup for the phase files.
+
+Pins the BLAS/OpenMP thread pools to one thread unless the caller has
+already set them. Under pytest-xdist every worker would otherwise start
+a pool per core, oversubscribing the CPU, and the test frames are far
+too small to gain from threaded BLAS. The variables are only read when
+numpy is first imported, and pytest loads this file (in every worker)
+before any phase module.
+"""
+
+import os
+
+for _var in ("OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "OMP_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
@@ -5,54 +5,109 @@ Runs all test phases in order and reports a summary.
 Execute from the project root:
 
     python tests/run_all_tests.py
+    python tests/run_all_tests.py --isolated   # one interpreter per phase
+
+All phases run in one pytest session, so numpy, scipy and matplotlib
+are imported once (per worker) rather than once per phase. The phase
+files are collected in name order (phase 1 to 7); each one can still be
+run on its own with `python tests/test_phaseN_*.py`.
+
+If pytest-xdist is installed, the phase files are spread across one
+worker per core (`-n auto --dist=loadfile`). loadfile keeps each file on
+a single worker, in file order.
+
+Without pytest, the phase files are run as scripts in this process
+with runpy, so the shared imports are still paid once.
+
+--isolated runs every phase file as its own script in a fresh
+interpreter, to rule out state shared between phases. Output is captured
+and only printed for phases that fail.
 """
 
-import subprocess
 import sys
 import os
+import glob
+import runpy
+import traceback
+import subprocess
+import importlib.util
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _phase_paths() -> list[str]:
+    """Phase files in name order (phase 1 to 7)."""
+    return sorted(glob.glob(os.path.join(TESTS_DIR, "test_phase*.py")))
+
+
+def run_all() -> int:
+    """
+    Run every phase file in a single pytest session, in parallel per file
+    when pytest-xdist is available.
+
+    Returns:
+        pytest exit code (0 if all tests passed).
+    """
+    import pytest
+
+    args = [TESTS_DIR, "-q", "--tb=short"]
+    if importlib.util.find_spec("xdist") is not None:
+        args += ["-n", "auto", "--dist=loadfile"]
+    return int(pytest.main(args))
+
+
+def run_in_process() -> int:
+    """
+    Run each phase file's __main__ block in this interpreter with runpy.
+
+    Used when pytest is not installed. A phase stops at its first failing
+    test; the traceback is printed and the remaining phases still run.
+
+    Returns:
+        0 if every phase passed, 1 otherwise.
+    """
+    failed = []
+    paths = _phase_paths()
+    for path in paths:
+        label = os.path.basename(path)
+        try:
+            runpy.run_path(path, run_name="__main__")
+        except (Exception, SystemExit):
+            failed.append(label)
+            traceback.print_exc()
+            print(f"    FAIL  {label}")
+
+    print(f"\n  Passed: {len(paths) - len(failed)}/{len(paths)}")
+    return 1 if failed else 0
+
+
+def run_isolated() -> int:
+    """
+    Run each phase file as a script in its own interpreter.
 
-TESTS = [
-    ("Phase 1 — Models",          "tests/test_phase1_models.py"),
-    ("Phase 2 — Stiffness",        "tests/test_phase2_stiffness.py"),
-    ("Phase 3 — Solver",           "tests/test_phase3_solver.py"),
-    ("Phase 4 — Failure",          "tests/test_phase4_failure.py"),
-    ("Phase 5 — Entropy",          "tests/test_phase5_entropy.py"),
-    ("Phase 6 — Simulation",       "tests/test_phase6_simulation.py"),
-    ("Phase 7 — Visualization",    "tests/test_phase7_visualization.py"),
-]
-
-
-def run_all():
-    """Run each test file as a subprocess and report pass/fail per phase."""
-    passed, failed = [], []
-
-    for label, path in TESTS:
-        print(f"\n{'='*50}")
-        print(f"Running: {label}")
-        print('='*50)
-        result = subprocess.run(
-            [sys.executable, path],
-            capture_output=False
-        )
+    Returns:
+        0 if every phase passed, 1 otherwise.
+    """
+    failed = []
+    paths = _phase_paths()
+    for path in paths:
+        label = os.path.basename(path)
+        result = subprocess.run([sys.executable, path], capture_output=True, text=True)
         if result.returncode == 0:
-            passed.append(label)
+            print(f"    PASS  {label}")
         else:
             failed.append(label)
+            print(f"    FAIL  {label}")
+            print(result.stdout, end="")
+            print(result.stderr, end="", file=sys.stderr)
 
-    print(f"\n{'='*50}")
-    print("SUMMARY")
-    print('='*50)
-    print(f"  Passed: {len(passed)}/{len(TESTS)}")
-    for p in passed:
-        print(f"    PASS  {p}")
-    if failed:
-        print(f"  Failed: {len(failed)}/{len(TESTS)}")
-        for f in failed:
-            print(f"    FAIL  {f}")
-        sys.exit(1)
-    else:
-        print("\nAll tests passed.")
+    print(f"\n  Passed: {len(paths) - len(failed)}/{len(paths)}")
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
-    run_all()
\ No newline at end of file
+    if "--isolated" in sys.argv[1:]:
+        sys.exit(run_isolated())
+    if importlib.util.find_spec("pytest") is None:
+        sys.exit(run_in_process())
+    sys.exit(run_all())
@@ -8,6 +8,7 @@ No solver logic is tested here — pure data contract validation.
 
 import sys
 import dataclasses
+import numpy as np
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -63,18 +64,71 @@ def test_frame_3d_redundant_build():
     print("  PASS: frame_3d_redundant builds correctly")
 
 
+def test_build_returns_independent_frames():
+    """Editing one built frame's nodes or members does not leak into the next build()."""
+    frame = frame_2d_simple.build()
+    frame.nodes[1].fixed_dofs.append(5)
+    frame.members[0].failed = True
+    fresh = frame_2d_simple.build()
+    assert fresh.nodes[1].fixed_dofs == []
+    assert not fresh.members[0].failed
+    print("  PASS: build() returns independent frames")
+
+
+def test_frame_id_lookup():
+    """get_node/get_member return the matching objects and raise ValueError for unknown IDs."""
+    frame = frame_3d_redundant.build()
+    assert frame.get_node(frame.nodes[3].id) is frame.nodes[3]
+    assert frame.get_member(frame.members[5].id) is frame.members[5]
+    for lookup in (frame.get_node, frame.get_member):
+        try:
+            lookup(999)
+            assert False, "Should have raised ValueError"
+        except ValueError:
+            pass
+    print("  PASS: FrameData id lookups")
+
+
+def test_frame_arrays():
+    """FrameData.arrays() packs coordinates, connectivity, sections and DOFs and is cached."""
+    frame = frame_3d_redundant.build()
+    arrays = frame.arrays()
+    assert arrays is frame.arrays(), "Arrays should be built once"
+    assert arrays.node_xyz.shape == (len(frame.nodes), 3)
+    assert arrays.member_conn.dtype == np.int32
+    for node in frame.nodes:
+        assert tuple(arrays.node_xyz[node.id]) == (node.x, node.y, node.z)
+    for m, member in enumerate(frame.members):
+        assert tuple(arrays.member_conn[m]) == (member.node_start, member.node_end)
+        assert tuple(arrays.member_EAI[m]) == (member.E, member.A, member.I)
+        assert list(arrays.member_dofs[m]) == \
+            list(range(member.node_start * 6, member.node_start * 6 + 6)) + \
+            list(range(member.node_end * 6, member.node_end * 6 + 6))
+    print("  PASS: FrameData SoA arrays")
+
+
 def test_energy_state():
     """EnergyState and MemberState instantiate correctly."""
     ms = MemberState(member_id=0, strain_energy=100.0, axial_force=5000.0, deformation=0.001)
-    es = EnergyState(step=0, total_energy=100.0, member_states=[ms])
+    es = EnergyState.from_member_states(step=0, member_states=[ms])
     assert es.total_energy == 100.0
+    assert es.member_states[0] == ms
+    try:
+        ms.strain_energy = 0.0
+        raise AssertionError("MemberState should be frozen")
+    except dataclasses.FrozenInstanceError:
+        pass
     print("  PASS: EnergyState instantiation")
 
 
 def test_entropy_record():
     """EntropyRecord instantiates correctly."""
-    r = EntropyRecord(step=0, entropy=1.2, delta_entropy=-0.1, energy_distribution=[(0, 0.6), (1, 0.4)])
+    r = EntropyRecord(
+        step=0, entropy=1.2, delta_entropy=-0.1,
+        energy_distribution=(np.array([0, 1]), np.array([0.6, 0.4]))
+    )
     assert r.entropy == 1.2
+    assert r.energy_distribution_list == [(0, 0.6), (1, 0.4)]
     print("  PASS: EntropyRecord instantiation")
 
 
@@ -85,6 +139,9 @@ if __name__ == "__main__":
     test_load_instantiation()
     test_frame_2d_simple_build()
     test_frame_3d_redundant_build()
+    test_build_returns_independent_frames()
+    test_frame_id_lookup()
+    test_frame_arrays()
     test_energy_state()
     test_entropy_record()
     print("All Phase 1 tests passed.\n")
\ No newline at end of file
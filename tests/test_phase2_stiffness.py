@@ -5,8 +5,12 @@ Phase 2: Verify stiffness matrix assembly.
 
 Checks:
   - K has the correct shape (n_nodes * 6)
-  - K is symmetric
+  - K is symmetric (max |K - K^T| below 1e-6)
   - Boundary conditions zero out the correct rows/cols
+  - Sparse and dense assembly (with BCs) match a member-by-member reference
+  - Element k and T match hand-written reference matrices
+  - Truss elements equal beam elements with zero bending stiffness
+  - Element matrices are cached per frame and reused after failures
 """
 
 import sys
@@ -15,7 +19,13 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 import numpy as np
 from structure.frames import frame_2d_simple, frame_3d_redundant
-from structure.stiffness import assemble_global_stiffness, apply_boundary_conditions
+from structure.stiffness import (
+    assemble_global_stiffness, apply_boundary_conditions,
+    assemble_global_stiffness_sparse,
+    _local_stiffness, _transformation_matrix,
+    _local_stiffness_batch, _transformation_batch, _member_geometry,
+    _element_matrices_batch, _element_matrices
+)
 
 
 def test_k_shape_2d():
@@ -31,7 +41,8 @@ def test_k_symmetry_2d():
     """K is symmetric for 2D simple frame."""
     frame = frame_2d_simple.build()
     K = assemble_global_stiffness(frame)
-    assert np.allclose(K, K.T, atol=1e-6), "K is not symmetric"
+    asym = float(np.max(np.abs(K - K.T)))
+    assert asym < 1e-6, f"K is not symmetric (max |K - K^T| = {asym})"
     print("  PASS: K is symmetric")
 
 
@@ -48,7 +59,8 @@ def test_k_symmetry_3d():
     """K is symmetric for 3D redundant frame."""
     frame = frame_3d_redundant.build()
     K = assemble_global_stiffness(frame)
-    assert np.allclose(K, K.T, atol=1e-6), "K is not symmetric for 3D frame"
+    asym = float(np.max(np.abs(K - K.T)))
+    assert asym < 1e-6, f"K is not symmetric for 3D frame (max |K - K^T| = {asym})"
     print("  PASS: K is symmetric (3D)")
 
 
@@ -58,18 +70,120 @@ def test_boundary_conditions_2d():
     K = assemble_global_stiffness(frame)
     K = apply_boundary_conditions(K, frame)
 
-    for node in frame.nodes:
-        for dof in node.fixed_dofs:
-            gdof = node.id * 6 + dof
-            row_sum = np.sum(np.abs(K[gdof, :])) - K[gdof, gdof]
-            col_sum = np.sum(np.abs(K[:, gdof])) - K[gdof, gdof]
-            assert row_sum < 1e-10, f"Row {gdof} not zeroed: sum={row_sum}"
-            assert col_sum < 1e-10, f"Col {gdof} not zeroed: sum={col_sum}"
-            assert K[gdof, gdof] == 1.0, f"Diagonal {gdof} not set to 1"
+    fixed = np.array([node.id * 6 + dof for node in frame.nodes for dof in node.fixed_dofs])
+    diag = np.abs(K[fixed, fixed])
+    row_sums = np.abs(K[fixed, :]).sum(axis=1) - diag
+    col_sums = np.abs(K[:, fixed]).sum(axis=0) - diag
+    assert (row_sums < 1e-10).all(), f"Rows {fixed[row_sums >= 1e-10]} not zeroed"
+    assert (col_sums < 1e-10).all(), f"Cols {fixed[col_sums >= 1e-10]} not zeroed"
+    assert (K[fixed, fixed] == 1.0).all(), f"Diagonals {fixed[K[fixed, fixed] != 1.0]} not set to 1"
 
     print("  PASS: Boundary conditions applied correctly")
 
 
+def _reference_stiffness(frame) -> np.ndarray:
+    """Dense K assembled member by member with explicit per-entry scatter."""
+    n_dof = len(frame.nodes) * 6
+    K = np.zeros((n_dof, n_dof))
+    for member in frame.members:
+        if member.failed:
+            continue
+        T = _transformation_matrix(member, frame)
+        k_global = T.T @ _local_stiffness(member, frame) @ T
+        dofs = [member.node_start * 6 + d for d in range(6)] + \
+               [member.node_end * 6 + d for d in range(6)]
+        for a, row in enumerate(dofs):
+            for b, col in enumerate(dofs):
+                K[row, col] += k_global[a, b]
+    return K
+
+
+def test_sparse_matches_dense_3d():
+    """Sparse and dense K (with BCs) equal a member-by-member dense assembly."""
+    frame = frame_3d_redundant.build()
+    frame.members[0].failed = True
+    K_ref = apply_boundary_conditions(_reference_stiffness(frame), frame)
+    K_dense = apply_boundary_conditions(assemble_global_stiffness(frame), frame)
+    K_sparse = apply_boundary_conditions(assemble_global_stiffness_sparse(frame).toarray(), frame)
+    scale = np.abs(K_ref).max()
+    assert np.allclose(K_dense, K_ref, rtol=1e-12, atol=1e-12 * scale), "Dense K differs from reference"
+    assert np.allclose(K_sparse, K_ref, rtol=1e-12, atol=1e-12 * scale), \
+        "Sparse K differs from reference"
+    print(f"  PASS: Sparse and dense K match reference ({np.count_nonzero(K_sparse)} nonzeros)")
+
+
+def test_element_matrices_match_reference():
+    """k_local and T match hand-written textbook matrices."""
+    # E=2, A=3, I=4, L=2 gives EA/L = 3, EI/L = 4, EI/L^2 = 2, EI/L^3 = 1
+    k = _local_stiffness_batch(np.array([2.0]), np.array([3.0]), np.array([4.0]), np.array([2.0]))[0]
+    in_plane = [0, 1, 5, 6, 7, 11]  # ux, uy, rz at each end
+    k_2d = np.array([
+        [ 3,   0,   0, -3,   0,   0],
+        [ 0,  12,  12,  0, -12,  12],
+        [ 0,  12,  16,  0, -12,   8],
+        [-3,   0,   0,  3,   0,   0],
+        [ 0, -12, -12,  0,  12, -12],
+        [ 0,  12,   8,  0, -12,  16],
+    ], dtype=float)
+    assert np.array_equal(k[np.ix_(in_plane, in_plane)], k_2d)
+    assert np.count_nonzero(k) == np.count_nonzero(k_2d), "Only in-plane DOFs should be stiff"
+
+    # Rows of R are the local x, y, z axes in global coordinates
+    s = np.sqrt(0.5)
+    cases = [
+        ([1.0, 0.0, 0.0], [[1, 0, 0], [0, 1, 0], [0, 0, 1]]),    # along X
+        ([0.0, 1.0, 0.0], [[0, 1, 0], [0, 0, 1], [1, 0, 0]]),    # along Y (ref falls back to Z)
+        ([0.0, 0.0, 1.0], [[0, 0, 1], [0, 1, 0], [-1, 0, 0]]),   # along Z
+        ([s, s, 0.0],     [[s, s, 0], [-s, s, 0], [0, 0, 1]]),   # 45 degrees in XY
+    ]
+    T = _transformation_batch(np.array([axis for axis, _ in cases]))
+    for T_i, (_, R) in zip(T, cases):
+        assert np.allclose(T_i, np.kron(np.eye(4), R), atol=1e-12)
+
+    # The per-member wrappers agree (frame_2d_simple members run along +X)
+    frame = frame_2d_simple.build()
+    assert np.allclose(_transformation_matrix(frame.members[0], frame), np.eye(12))
+    assert np.isclose(_local_stiffness(frame.members[0], frame)[0, 0],
+                      frame.members[0].E * frame.members[0].A / 5.0)
+    print("  PASS: Element k and T match reference matrices")
+
+
+def test_truss_elements_match_axial_beam():
+    """element_type "truss" gives the beam matrices with I = 0; unknown types raise."""
+    frame = frame_3d_redundant.build()
+    starts = np.array([m.node_start for m in frame.members])
+    ends = np.array([m.node_end for m in frame.members])
+    L, axis = _member_geometry(frame.arrays().node_xyz, starts, ends)
+    E = np.array([m.E for m in frame.members])
+    A = np.array([m.A for m in frame.members])
+
+    kg_truss, kT_truss = _element_matrices_batch("truss", E, A, np.ones_like(E), L, axis)
+    kg_beam, kT_beam = _element_matrices_batch("beam", E, A, np.zeros_like(E), L, axis)
+    assert np.allclose(kg_truss, kg_beam, rtol=1e-12, atol=1e-3)
+    assert np.allclose(kT_truss, kT_beam, rtol=1e-12, atol=1e-3)
+    try:
+        _element_matrices_batch("shell", E, A, A, L, axis)
+        assert False, "Should have raised ValueError"
+    except ValueError:
+        pass
+    print("  PASS: Truss elements match axial-only beam elements")
+
+
+def test_element_matrices_cached_across_failures():
+    """Assembly after a failure reuses the cached element matrices and matches a fresh frame."""
+    frame = frame_3d_redundant.build()
+    assemble_global_stiffness_sparse(frame)
+    elements = _element_matrices(frame)
+    frame.members[4].failed = True
+    K = assemble_global_stiffness_sparse(frame)
+    assert _element_matrices(frame) is elements, "Element matrices should be built once"
+
+    fresh = frame_3d_redundant.build()
+    fresh.members[4].failed = True
+    assert np.array_equal(K.toarray(), assemble_global_stiffness_sparse(fresh).toarray())
+    print("  PASS: Element matrices cached across failures")
+
+
 if __name__ == "__main__":
     print("=== Phase 2: Stiffness Assembly ===")
     test_k_shape_2d()
@@ -77,4 +191,8 @@ if __name__ == "__main__":
     test_k_shape_3d()
     test_k_symmetry_3d()
     test_boundary_conditions_2d()
+    test_sparse_matches_dense_3d()
+    test_element_matrices_match_reference()
+    test_truss_elements_match_axial_beam()
+    test_element_matrices_cached_across_failures()
     print("All Phase 2 tests passed.\n")
\ No newline at end of file
@@ -8,16 +8,32 @@ Checks:
   - Midspan node deflects downward (negative uy) under downward load
   - All active member strain energies are non-negative
   - Total energy equals sum of member energies
+  - Cached sparse solve matches a dense least-squares solve of K u = F
+  - The cached free-DOF triplets match the free block of the sparse global K
+  - Cached stiffness factorization is reused and invalidated on failure
+  - The RCM ordering is reused after a small failure event without changing u
+  - The threaded member kernel matches the serial kernel on the Pratt bridge
+  - A truss frame solves like axial-only beams; free truss rotations raise ValueError
+  - invalidate_stiffness_cache picks up in-place material edits
 """
 
 import sys
+import dataclasses
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import numpy as np
-from structure.frames import frame_2d_simple, frame_3d_redundant
-from structure.stiffness import assemble_global_stiffness, apply_boundary_conditions
-from solver.equilibrium import solve, _build_load_vector, _solve_system
+from structure.frames import frame_2d_simple, frame_3d_redundant, frame_pratt_bridge
+from structure.stiffness import (
+    assemble_global_stiffness, apply_boundary_conditions,
+    assemble_global_stiffness_sparse
+)
+import solver.equilibrium as equilibrium
+from solver.equilibrium import (
+    solve, _build_load_vector, _displacements, _fixed_dof_indices,
+    _assemble_free, _free_dof_indices,
+    invalidate_stiffness_cache
+)
 
 
 def test_solve_returns_energy_state():
@@ -33,10 +49,7 @@ def test_solve_returns_energy_state():
 def test_midspan_deflects_downward():
     """Midspan node (Node 1) has negative uy displacement under downward load."""
     frame = frame_2d_simple.build()
-    K = assemble_global_stiffness(frame)
-    K = apply_boundary_conditions(K, frame)
-    F = _build_load_vector(frame)
-    u = _solve_system(K, F)
+    u = _displacements(frame, load_factor=1.0)
 
     # Node 1 uy = DOF index (1 * 6 + 1) = 7
     uy_midspan = u[1 * 6 + 1]
@@ -44,6 +57,39 @@ def test_midspan_deflects_downward():
     print(f"  PASS: Midspan uy = {uy_midspan:.6e} m (downward)")
 
 
+def test_displacements_match_dense_solve():
+    """_displacements (cached sparse K_ff solve) matches a dense solve of the full K."""
+    for build in (frame_2d_simple.build, frame_3d_redundant.build):
+        for failed_member in (None, 1):
+            frame = build()
+            if failed_member is not None:
+                frame.members[failed_member].failed = True
+            K = apply_boundary_conditions(assemble_global_stiffness(frame), frame)
+            F = _build_load_vector(frame)
+            F[_fixed_dof_indices(frame)] = 0.0  # Constrained DOFs stay at u = 0
+            # Minimum-norm solution, as the pinv fallback gives for a singular K_ff
+            u_dense = np.linalg.lstsq(K, F, rcond=None)[0]
+            u = _displacements(frame, load_factor=1.0)
+            assert np.allclose(u, u_dense, rtol=1e-6, atol=1e-6 * np.abs(u_dense).max())
+    print("  PASS: Cached sparse solve matches dense solve")
+
+
+def test_free_assembly_matches_sliced():
+    """_assemble_free equals the free-DOF block of assemble_global_stiffness_sparse, before and after a failure."""
+    for failed_member in (None, 3):
+        frame = frame_3d_redundant.build()
+        if failed_member is not None:
+            frame.members[failed_member].failed = True
+        free = _free_dof_indices(frame)
+        active = np.array([not m.failed for m in frame.members])
+        K_sliced = assemble_global_stiffness_sparse(frame)[free][:, free]
+        K_free = _assemble_free(frame, active)
+        assert np.allclose(K_free.toarray(), K_sliced.toarray(), rtol=1e-12, atol=1e-6)
+        assert np.array_equal(K_free.toarray() != 0, K_sliced.toarray() != 0), \
+            "Failed members must leave no roundoff entries behind"
+    print("  PASS: Free-DOF triplet assembly matches sliced K")
+
+
 def test_strain_energies_non_negative():
     """All active member strain energies are >= 0."""
     frame = frame_2d_simple.build()
@@ -57,7 +103,7 @@ def test_total_energy_consistent():
     """EnergyState.total_energy equals sum of member strain energies."""
     frame = frame_2d_simple.build()
     es = solve(frame, step=0)
-    computed_total = sum(ms.strain_energy for ms in es.member_states)
+    computed_total = float(np.sum(es.strain_energy))
     assert abs(es.total_energy - computed_total) < 1e-10, \
         f"Total mismatch: {es.total_energy} vs {computed_total}"
     print(f"  PASS: Total energy consistent ({es.total_energy:.4f} J)")
@@ -72,11 +118,135 @@ def test_solve_3d():
     print(f"  PASS: 3D frame solved (total energy = {es.total_energy:.4f} J)")
 
 
+def test_factorization_cache_tracks_failures():
+    """The cached factorization is reused until a member fails."""
+    frame = frame_3d_redundant.build()
+    es_first = solve(frame, step=0)
+    cached = frame._cache["stiffness"]
+    tables = frame._cache["members"]
+    solve(frame, step=1)
+    assert frame._cache["members"] is tables, "Member tables should be built once"
+    assert frame._cache["stiffness"] is cached, "Factorization should be reused"
+
+    frame.members[0].failed = True
+    es_failed = solve(frame, step=2)
+    assert frame._cache["stiffness"] is not cached, "Failure should invalidate the cache"
+    assert frame._cache["members"].kg_all.shape == (8, 12, 12)
+
+    fresh = frame_3d_redundant.build()
+    fresh.members[0].failed = True
+    es_fresh = solve(fresh, step=2)
+    assert np.allclose(es_failed.strain_energy, es_fresh.strain_energy)
+    assert not np.allclose(es_failed.strain_energy, es_first.strain_energy)
+    print("  PASS: Stiffness factorization cached per failure state")
+
+
+def test_rcm_ordering_reused_across_failures():
+    """Below the change threshold the old RCM ordering is kept and results are unchanged."""
+    frame = frame_3d_redundant.build()
+    solve(frame, step=0)
+    perm = frame._cache["rcm"][1]
+
+    saved = equilibrium._RCM_REUSE_FRACTION
+    equilibrium._RCM_REUSE_FRACTION = 0.5
+    try:
+        frame.members[0].failed = True
+        es_reused = solve(frame, step=1)
+    finally:
+        equilibrium._RCM_REUSE_FRACTION = saved
+    assert frame._cache["rcm"][1] is perm, "RCM ordering should be reused"
+
+    fresh = frame_3d_redundant.build()
+    fresh.members[0].failed = True
+    es_fresh = solve(fresh, step=1)
+    assert np.allclose(es_reused.strain_energy, es_fresh.strain_energy, rtol=1e-9)
+    print("  PASS: RCM ordering reused across a small failure event")
+
+
+def test_sharded_member_kernel_matches_serial():
+    """The threaded member kernel gives the serial results, intact and after a failure."""
+    def run(failed_member):
+        frame = frame_pratt_bridge.build()
+        if failed_member is not None:
+            frame.members[failed_member].failed = True
+        return solve(frame, step=0)
+
+    cases = (None, 5)
+    serial = [run(k) for k in cases]
+
+    saved = equilibrium._PARALLEL_MIN_MEMBERS, equilibrium._worker_count
+    equilibrium._PARALLEL_MIN_MEMBERS = 2
+    equilibrium._worker_count = lambda: 4
+    try:
+        sharded = [run(k) for k in cases]
+    finally:
+        equilibrium._PARALLEL_MIN_MEMBERS, equilibrium._worker_count = saved
+
+    for es_serial, es_sharded in zip(serial, sharded):
+        for field in ("strain_energy", "axial_force", "deformation"):
+            np.testing.assert_allclose(
+                getattr(es_sharded, field), getattr(es_serial, field), rtol=1e-12, atol=0.0
+            )
+        assert np.array_equal(es_sharded.failed, es_serial.failed)
+    print("  PASS: Sharded member kernel matches the serial kernel")
+
+
+def test_truss_frame_matches_axial_beam():
+    """A pin-jointed truss frame solves like beams with I = 0; free rotations are rejected."""
+    beam = frame_pratt_bridge.build()
+    # Planar truss: restrain uz and all rotations, which truss members do not resist
+    nodes = [
+        dataclasses.replace(n, fixed_dofs=sorted(set(n.fixed_dofs) | {2, 3, 4, 5}))
+        for n in beam.nodes
+    ]
+    truss = dataclasses.replace(beam, nodes=nodes, element_type="truss")
+    axial_beam = frame_pratt_bridge.build()
+    axial_beam = dataclasses.replace(axial_beam, nodes=nodes)
+    for m in axial_beam.members:
+        m.material = dataclasses.replace(m.material, I=0.0)
+
+    es_truss = solve(truss, step=0)
+    es_beam = solve(axial_beam, step=0)
+    assert truss._cache["stiffness"][1][0] is not None, "Supported truss K_ff should factorize"
+    for field in ("strain_energy", "axial_force", "deformation"):
+        np.testing.assert_allclose(
+            getattr(es_truss, field), getattr(es_beam, field),
+            rtol=1e-9, atol=1e-9 * np.abs(getattr(es_beam, field)).max()
+        )
+
+    try:
+        dataclasses.replace(beam, element_type="truss")
+        assert False, "Should have raised ValueError"
+    except ValueError:
+        pass
+    print(f"  PASS: Truss frame matches axial-only beams (total energy = {es_truss.total_energy:.4f} J)")
+
+
+def test_invalidate_stiffness_cache():
+    """After an in-place material edit, invalidate_stiffness_cache makes solve() use the new stiffness."""
+    frame = frame_2d_simple.build()
+    es_before = solve(frame, step=0)
+    for m in frame.members:
+        m.material = dataclasses.replace(m.material, E=m.material.E * 2)
+    invalidate_stiffness_cache(frame)
+    es_after = solve(frame, step=1)
+    # Same loads, twice as stiff: half the displacement, half the strain energy
+    assert np.isclose(es_after.total_energy, es_before.total_energy / 2, rtol=1e-9)
+    print("  PASS: invalidate_stiffness_cache rebuilds with the edited material")
+
+
 if __name__ == "__main__":
     print("=== Phase 3: Equilibrium Solver ===")
     test_solve_returns_energy_state()
     test_midspan_deflects_downward()
+    test_displacements_match_dense_solve()
+    test_free_assembly_matches_sliced()
     test_strain_energies_non_negative()
     test_total_energy_consistent()
     test_solve_3d()
+    test_factorization_cache_tracks_failures()
+    test_rcm_ordering_reused_across_failures()
+    test_sharded_member_kernel_matches_serial()
+    test_truss_frame_matches_axial_beam()
+    test_invalidate_stiffness_cache()
     print("All Phase 3 tests passed.\n")
\ No newline at end of file
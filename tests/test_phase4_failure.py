@@ -5,20 +5,27 @@ Phase 4: Verify member failure detection and energy redistribution.
 
 Checks:
   - A member with very low sigma_y fails immediately under any load
-  - check_and_apply_failures returns the correct member ID
+  - check_and_apply_failures returns the correct member ID and sets its failed flag
+  - Batched combined stresses match a per-member computation
+  - The failure check reuses the displacements cached by solve()
   - Energy redistribution conserves total energy approximately
+  - The sparse coupling matrix is symmetric and couples only members sharing a node
+  - Redistribution of uniform energies is a no-op
   - all_failed() correctly detects total collapse
 """
 
 import sys
 import dataclasses
 import os
+import numpy as np
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from structure.frames import frame_2d_simple
-from solver.equilibrium import solve
-from solver.failure import check_and_apply_failures, all_failed
-from solver.redistribution import redistribute
+from structure.frames import frame_2d_simple, frame_3d_redundant
+from structure.stiffness import _local_stiffness, _transformation_matrix
+from solver.equilibrium import solve, member_response, _build_load_vector, _stiffness_factorization, _solve_factorized
+from solver.failure import check_and_apply_failures, all_failed, _combined_stresses
+from solver.redistribution import redistribute, _build_coupling_matrix
+from core.models import EnergyState
 
 
 def test_member_fails_under_low_capacity():
@@ -34,14 +41,33 @@ def test_member_fails_under_low_capacity():
     print(f"  PASS: Member 0 failed as expected (sigma_y=1 Pa, force={es.member_states[0].axial_force:.2f} N)")
 
 
-def test_failure_marks_member_in_frame():
-    """After failure, frame.members[0].failed is True."""
-    frame = frame_2d_simple.build()
-    frame.members[0].material = dataclasses.replace(frame.members[0].material, sigma_y=1.0)
-    es = solve(frame, step=0)
-    check_and_apply_failures(frame, es)
-    assert frame.members[0].failed == True
-    print("  PASS: member.failed flag set correctly")
+def test_combined_stresses_match_per_member():
+    """_combined_stresses agrees with the per-member T/k force recovery."""
+    frame = frame_3d_redundant.build()
+    solve(frame, step=0)
+    u = _solve_factorized(_stiffness_factorization(frame), _build_load_vector(frame))
+    sigma = _combined_stresses(member_response(frame, 1.0), np.arange(len(frame.members)))
+
+    for m, member in enumerate(frame.members):
+        dofs = list(range(member.node_start * 6, member.node_start * 6 + 6)) + \
+               list(range(member.node_end * 6, member.node_end * 6 + 6))
+        f_local = _local_stiffness(member, frame) @ (_transformation_matrix(member, frame) @ u[dofs])
+        c = np.sqrt(member.I / member.A)
+        expected = abs(f_local[0]) / member.A + max(abs(f_local[5]), abs(f_local[11])) * c / member.I
+        assert np.isclose(sigma[m], expected, rtol=1e-9), f"Member {member.id}: {sigma[m]} vs {expected}"
+    print("  PASS: Batched combined stresses match per-member computation")
+
+
+def test_failure_check_reuses_displacements():
+    """check_and_apply_failures reuses u from solve() at the same load factor."""
+    frame = frame_3d_redundant.build()
+    es = solve(frame, step=0, load_factor=1.5)
+    cached = frame._cache["displacements"]
+    check_and_apply_failures(frame, es, load_factor=1.5)
+    assert frame._cache["displacements"] is cached, "Failure check should not re-solve"
+    check_and_apply_failures(frame, es, load_factor=2.0)
+    assert frame._cache["displacements"] is not cached, "New load factor should re-solve"
+    print("  PASS: Failure check reuses cached displacements")
 
 
 def test_redistribution_conserves_energy():
@@ -65,6 +91,38 @@ def test_redistribution_conserves_energy():
     print(f"  PASS: Energy before={energy_before:.4f}, after={energy_after:.4f} J")
 
 
+def test_coupling_matrix_sparse_and_symmetric():
+    """alpha is sparse, symmetric, zero on the diagonal and nonzero only for members sharing a node."""
+    frame = frame_2d_simple.build()
+    ids = [m.id for m in frame.members]
+    alpha = _build_coupling_matrix(frame, ids).toarray()
+    assert "displacements" not in frame._cache, "Coupling needs EA/L only, not a solve"
+    assert np.allclose(alpha, alpha.T)
+    assert np.all(np.diag(alpha) == 0.0)
+    for i, m_i in enumerate(frame.members):
+        for j, m_j in enumerate(frame.members):
+            shares = {m_i.node_start, m_i.node_end} & {m_j.node_start, m_j.node_end}
+            assert (alpha[i, j] > 0) == (i != j and bool(shares))
+    print("  PASS: Coupling matrix is symmetric and follows connectivity")
+
+
+def test_redistribution_uniform_is_noop():
+    """With equal energies in every member dU is zero and the state is returned unchanged."""
+    frame = frame_2d_simple.build()
+    n = len(frame.members)
+    es = EnergyState(
+        step=0,
+        total_energy=float(n),
+        member_ids=np.array([m.id for m in frame.members]),
+        strain_energy=np.ones(n),
+        axial_force=np.zeros(n),
+        deformation=np.zeros(n),
+        failed=np.zeros(n, dtype=bool),
+    )
+    assert redistribute(frame, es, dt=1.0) is es
+    print("  PASS: Uniform energies short-circuit redistribution")
+
+
 def test_all_failed_false_initially():
     """all_failed() returns False when no members have failed."""
     frame = frame_2d_simple.build()
@@ -84,8 +142,11 @@ def test_all_failed_true_when_all_marked():
 if __name__ == "__main__":
     print("=== Phase 4: Failure & Redistribution ===")
     test_member_fails_under_low_capacity()
-    test_failure_marks_member_in_frame()
+    test_combined_stresses_match_per_member()
+    test_failure_check_reuses_displacements()
     test_redistribution_conserves_energy()
+    test_coupling_matrix_sparse_and_symmetric()
+    test_redistribution_uniform_is_noop()
     test_all_failed_false_initially()
     test_all_failed_true_when_all_marked()
     print("All Phase 4 tests passed.\n")
\ No newline at end of file
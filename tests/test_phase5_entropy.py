@@ -8,7 +8,10 @@ Checks:
   - S ≈ ln(n) when energy is perfectly uniform (maximum entropy)
   - delta_entropy has correct sign between steps
   - normalized_entropy returns value in [0, 1]
+  - normalized_entropy_batch matches normalized_entropy step by step
   - Gini = 0 for uniform, Gini → 1 for concentrated distribution
+  - Online z-score detector agrees with the batch detector
+  - Earlier dS values are re-scored against the full-history statistics
 """
 
 import sys
@@ -17,9 +20,12 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 import math
 import numpy as np
-from core.models import EnergyState, MemberState
-from entropy.metrics import compute, max_entropy, normalized_entropy
-from entropy.localization import localization_index, most_localized_members
+from core.models import EnergyState, MemberState, EntropyRecord, HistoryBuffers
+from entropy.metrics import compute, max_entropy, normalized_entropy, normalized_entropy_batch
+from entropy.localization import (
+    localization_index, most_localized_members, ZScoreDetector, detect_collapse_zscore,
+    detect_collapse_threshold
+)
 
 
 def _make_energy_state(energies: list[float], step: int = 0) -> EnergyState:
@@ -28,13 +34,18 @@ def _make_energy_state(energies: list[float], step: int = 0) -> EnergyState:
         MemberState(member_id=i, strain_energy=e, axial_force=0.0, deformation=0.0)
         for i, e in enumerate(energies)
     ]
-    return EnergyState(step=step, total_energy=sum(energies), member_states=member_states)
+    return EnergyState.from_member_states(step, member_states)
+
+
+# EnergyState is frozen, so the fixed inputs are built once and shared
+ES_UNIFORM_4 = _make_energy_state([250.0] * 4)
+ES_ALL_IN_ONE = _make_energy_state([1000.0, 0.0, 0.0, 0.0])
+ES_CONCENTRATED = _make_energy_state([990.0, 5.0, 3.0, 2.0])
 
 
 def test_entropy_zero_when_all_in_one_member():
     """S ≈ 0 when all energy is concentrated in one member."""
-    es = _make_energy_state([1000.0, 0.0, 0.0, 0.0])
-    record = compute(es, previous_entropy=0.0)
+    record = compute(ES_ALL_IN_ONE, previous_entropy=0.0)
     assert record.entropy < 0.01, f"Expected S≈0, got {record.entropy}"
     print(f"  PASS: S = {record.entropy:.6f} (concentrated energy)")
 
@@ -42,8 +53,7 @@ def test_entropy_zero_when_all_in_one_member():
 def test_entropy_max_when_uniform():
     """S ≈ ln(n) when energy is perfectly uniform across n members."""
     n = 4
-    es = _make_energy_state([250.0] * n)
-    record = compute(es, previous_entropy=0.0)
+    record = compute(ES_UNIFORM_4, previous_entropy=0.0)
     expected = math.log(n)
     assert abs(record.entropy - expected) < 1e-6, \
         f"Expected S={expected:.4f}, got {record.entropy:.4f}"
@@ -52,8 +62,7 @@ def test_entropy_max_when_uniform():
 
 def test_delta_entropy_negative_when_energy_concentrates():
     """dS is negative when energy becomes more concentrated over steps."""
-    es_uniform = _make_energy_state([250.0, 250.0, 250.0, 250.0], step=0)
-    record_uniform = compute(es_uniform, previous_entropy=0.0)
+    record_uniform = compute(ES_UNIFORM_4, previous_entropy=0.0)
 
     es_concentrated = _make_energy_state([900.0, 50.0, 25.0, 25.0], step=1)
     record_concentrated = compute(es_concentrated, previous_entropy=record_uniform.entropy)
@@ -72,9 +81,22 @@ def test_normalized_entropy_in_range():
     print(f"  PASS: Normalized entropy = {norm:.4f}")
 
 
+def test_normalized_entropy_batch_matches_scalar():
+    """normalized_entropy_batch agrees with normalized_entropy, including n <= 1."""
+    entropy = np.array([1.2, 0.9, 0.5, 0.0, 0.0])
+    n_active = np.array([5, 4, 2, 1, 0])
+    expected = [
+        normalized_entropy(EntropyRecord(step=i, entropy=s, delta_entropy=0.0,
+                                         energy_distribution=(np.zeros(0), np.zeros(0))), int(n))
+        for i, (s, n) in enumerate(zip(entropy, n_active))
+    ]
+    assert np.allclose(normalized_entropy_batch(entropy, n_active), expected, rtol=1e-12)
+    print("  PASS: Batched normalized entropy matches the scalar version")
+
+
 def test_gini_zero_for_uniform():
     """Gini index ≈ 0 for uniform energy distribution."""
-    record = compute(_make_energy_state([250.0, 250.0, 250.0, 250.0]))
+    record = compute(ES_UNIFORM_4)
     gini = localization_index(record)
     assert gini < 0.05, f"Expected Gini≈0, got {gini:.4f}"
     print(f"  PASS: Gini = {gini:.4f} (uniform)")
@@ -82,9 +104,16 @@ def test_gini_zero_for_uniform():
 
 def test_gini_high_for_concentrated():
     """Gini index is high for concentrated energy."""
-    record = compute(_make_energy_state([990.0, 5.0, 3.0, 2.0]))
+    record = compute(ES_CONCENTRATED)
     gini = localization_index(record)
     assert gini > 0.5, f"Expected high Gini, got {gini:.4f}"
+    bare = EntropyRecord(
+        step=0, entropy=record.entropy, delta_entropy=0.0,
+        energy_distribution=record.energy_distribution
+    )
+    assert bare.gini is None
+    assert abs(localization_index(bare) - gini) < 1e-12, \
+        "Gini from energy_distribution should match compute()"
     print(f"  PASS: Gini = {gini:.4f} (concentrated)")
 
 
@@ -94,16 +123,73 @@ def test_most_localized_members():
     top = most_localized_members(record, top_n=2)
     assert top[0][0] == 0, f"Expected member 0 first, got {top[0][0]}"
     assert top[0][1] > top[1][1], "Top member should have higher p_i"
+    assert most_localized_members(record, top_n=1) == top[:1]
     print(f"  PASS: most_localized = {top}")
 
 
+def test_zscore_detector_flags_sudden_drop():
+    """ZScoreDetector flags a sharp dS drop, matching the batch detector."""
+    deltas = [0.01, -0.01, 0.02, 0.0, -0.02, 0.01, -0.01, 0.0, -2.0, 0.0]
+    history = [
+        EntropyRecord(
+            step=i, entropy=0.0, delta_entropy=d,
+            energy_distribution=(np.zeros(0, dtype=int), np.zeros(0))
+        )
+        for i, d in enumerate(deltas)
+    ]
+    detector = ZScoreDetector(z_threshold=2.5)
+    results = [detector.update(r) for r in history]
+    assert results[7] == (False, None)
+    assert results[8] == (True, 8), f"Expected collapse at step 8, got {results[8]}"
+    assert results[9] == (True, 8), "Detector should latch the first collapse step"
+
+    warmed = ZScoreDetector(z_threshold=2.5)
+    for r in history[:8]:
+        warmed.observe(r)
+    assert warmed.update(history[8]) == (True, 8), "observe() should feed the same statistics"
+    assert detect_collapse_zscore(history, z_threshold=2.5) == (True, 8)
+
+    buffers = HistoryBuffers.allocate(len(history), 1)
+    buffers.step[:] = np.arange(len(history))
+    buffers.delta[:] = deltas
+    buffers.n = len(history)
+    assert detect_collapse_zscore(history, z_threshold=2.5, buffers=buffers) == (True, 8)
+    assert detect_collapse_zscore(history[:8], z_threshold=2.5, buffers=buffers) == (False, None)
+    assert detect_collapse_threshold(history, threshold=-1.0) == (True, 8)
+    assert detect_collapse_threshold(history, threshold=-1.0, buffers=buffers) == (True, 8)
+    assert detect_collapse_threshold(history[:8], threshold=-1.0, buffers=buffers) == (False, None)
+    print("  PASS: z-score detector flagged step 8")
+
+
+def test_zscore_detector_rescores_earlier_steps():
+    """A dS that is not an outlier when seen is flagged once the full-history std shrinks."""
+    # One drop of -1 among zeros: its z-score is -sqrt(n - 1) after n records
+    history = [
+        EntropyRecord(
+            step=i, entropy=0.0, delta_entropy=-1.0 if i == 1 else 0.0,
+            energy_distribution=(np.zeros(0, dtype=int), np.zeros(0))
+        )
+        for i in range(10)
+    ]
+    detector = ZScoreDetector(z_threshold=2.5)
+    results = [detector.update(r) for r in history]
+    assert results[6] == (False, None), "z = -sqrt(6) is still above -2.5"
+    assert results[7] == (True, 1), f"Expected step 1 flagged at step 7, got {results[7]}"
+    assert detect_collapse_zscore(history[:7], z_threshold=2.5) == (False, None)
+    assert detect_collapse_zscore(history[:8], z_threshold=2.5) == (True, 1)
+    print("  PASS: step 1 flagged against the full history at step 7")
+
+
 if __name__ == "__main__":
     print("=== Phase 5: Entropy Metrics ===")
     test_entropy_zero_when_all_in_one_member()
     test_entropy_max_when_uniform()
     test_delta_entropy_negative_when_energy_concentrates()
     test_normalized_entropy_in_range()
+    test_normalized_entropy_batch_matches_scalar()
     test_gini_zero_for_uniform()
     test_gini_high_for_concentrated()
     test_most_localized_members()
+    test_zscore_detector_flags_sudden_drop()
+    test_zscore_detector_rescores_earlier_steps()
     print("All Phase 5 tests passed.\n")
\ No newline at end of file
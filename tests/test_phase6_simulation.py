@@ -9,16 +9,27 @@ Checks:
   - Entropy history length matches energy history length
   - With forced low sigma_y, collapse is detected
   - Without failure, simulation runs to max_steps with no collapse
+  - History buffers mirror the entropy history
+  - Detection is skipped before min_detect_step
+  - pratt_bridge collapses at step 32 under z-score detection (47 steps, 18 failures)
+  - Steady steps reuse the previous solve
+  - run_scenarios matches serial runs
+  - run_batch matches serial runs over a sigma_y sweep
+  - --scenarios names are stripped, deduplicated and validated
 """
 
 import sys
+import argparse
 import dataclasses
 import os
+import numpy as np
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from simulation.scenarios import run_scenario
+from simulation.scenarios import run_scenario, run_scenarios
 from simulation.runner import run
+from simulation.batch_runner import run_batch
 from structure.frames import frame_2d_simple
+from main import _scenario_list
 
 
 def test_2d_simple_runs():
@@ -79,6 +90,100 @@ def test_failed_sequence_order():
         print("  SKIP: No failures occurred")
 
 
+def test_history_buffers_match_records():
+    """result.history holds the same per-step metrics as entropy_history."""
+    result = run_scenario("2d_simple", max_steps=10)
+    history = result.history
+    n = len(result.entropy_history)
+    assert history.n == n
+    assert list(history.step[:n]) == [r.step for r in result.entropy_history]
+    assert list(history.entropy[:n]) == [r.entropy for r in result.entropy_history]
+    assert list(history.delta[:n]) == [r.delta_entropy for r in result.entropy_history]
+    assert history.p.dtype == np.float32
+    assert np.allclose(history.gini[:n], [r.gini for r in result.entropy_history], atol=1e-6)
+    for row, es, er in zip(history.p, result.energy_history, result.entropy_history):
+        assert np.allclose(row[~es.failed], er.energy_distribution[1], atol=1e-6)
+        assert not row[es.failed].any()
+
+    # Records not produced by compute() carry no gini and are rejected
+    bare = dataclasses.replace(result.entropy_history[0], gini=None)
+    try:
+        history.record(result.energy_history[0], bare)
+        assert False, "Should have raised ValueError"
+    except ValueError:
+        pass
+    print(f"  PASS: History buffers hold {n} steps")
+
+
+def test_min_detect_step_delays_detection():
+    """No collapse is reported before min_detect_step."""
+    # A threshold above any dS triggers on the first step that is checked
+    result = run(frame_2d_simple.build(), max_steps=10, collapse_method="threshold",
+                 collapse_threshold=10.0, min_detect_step=3)
+    assert result.collapse_detected and result.collapse_step == 3, \
+        f"Expected detection at step 3, got {result.collapse_step}"
+    print(f"  PASS: Detection started at step {result.collapse_step}")
+
+
+def test_pratt_bridge_collapse_step():
+    """The default pratt_bridge run (z-score detector) collapses at step 32 and stops after 47 steps with 18 failures."""
+    result = run_scenario("pratt_bridge")
+    assert result.collapse_detected
+    assert result.collapse_step == 32, f"Expected collapse at step 32, got {result.collapse_step}"
+    assert len(result.energy_history) == 47, f"Expected 47 steps, got {len(result.energy_history)}"
+    assert len(result.failed_sequence) == 18, \
+        f"Expected 18 failures, got {len(result.failed_sequence)}"
+    print(f"  PASS: pratt_bridge collapse at step {result.collapse_step} "
+          f"({len(result.energy_history)} steps, {len(result.failed_sequence)} failures)")
+
+
+def test_steady_steps_reuse_solve():
+    """Without failures or load changes, later steps reuse the first solve."""
+    frame = frame_2d_simple.build()
+    for m in frame.members:
+        m.material = dataclasses.replace(m.material, sigma_y=1e20)  # Indestructible
+
+    result = run(frame, max_steps=5, collapse_method="threshold", collapse_threshold=-999)
+    first = result.energy_history[0]
+    assert [s.step for s in result.energy_history] == list(range(5))
+    assert all(s.strain_energy is first.strain_energy for s in result.energy_history)
+    assert all(r.delta_entropy == 0.0 for r in result.entropy_history[1:])
+    print("  PASS: Steady steps reuse the step-0 solve")
+
+
+def test_run_scenarios_matches_serial():
+    """run_scenarios returns the same results as running each scenario serially."""
+    names = ["2d_simple", "3d_redundant"]
+    parallel = run_scenarios(names, max_workers=2, max_steps=10)
+    assert list(parallel) == names
+    for name in names:
+        serial = run_scenario(name, max_steps=10)
+        assert [r.entropy for r in parallel[name].entropy_history] == \
+               [r.entropy for r in serial.entropy_history]
+    print(f"  PASS: run_scenarios matches serial runs for {names}")
+
+
+def test_run_batch_matches_serial():
+    """run_batch returns the same results, in order, as running each frame serially."""
+    def variant(sigma_y):
+        frame = frame_2d_simple.build()
+        for m in frame.members:
+            m.material = dataclasses.replace(m.material, sigma_y=sigma_y)
+        return frame
+
+    sweep = [1.0, 1e20]
+    batch = run_batch([variant(s) for s in sweep], max_workers=2, max_steps=10,
+                      collapse_method="threshold", collapse_threshold=-0.01)
+    assert len(batch) == len(sweep)
+    for sigma_y, result in zip(sweep, batch):
+        serial = run(variant(sigma_y), max_steps=10,
+                     collapse_method="threshold", collapse_threshold=-0.01)
+        assert result.collapse_step == serial.collapse_step
+        assert [r.entropy for r in result.entropy_history] == \
+               [r.entropy for r in serial.entropy_history]
+    print(f"  PASS: run_batch matches serial runs for sigma_y in {sweep}")
+
+
 def test_unknown_scenario_raises():
     """run_scenario raises ValueError for unknown scenario name."""
     try:
@@ -88,6 +193,18 @@ def test_unknown_scenario_raises():
         print(f"  PASS: ValueError raised correctly: {e}")
 
 
+def test_scenario_list_parsing():
+    """--scenarios names are stripped, deduplicated in order and validated up front."""
+    assert _scenario_list(" pratt_bridge,2d_simple,, pratt_bridge ") == ["pratt_bridge", "2d_simple"]
+    for bad in (" , ", "2d_simple,nonexistent_scenario"):
+        try:
+            _scenario_list(bad)
+            assert False, f"Should have rejected {bad!r}"
+        except argparse.ArgumentTypeError:
+            pass
+    print("  PASS: --scenarios list normalized and validated")
+
+
 if __name__ == "__main__":
     print("=== Phase 6: Full Simulation Run ===")
     test_2d_simple_runs()
@@ -95,5 +212,12 @@ if __name__ == "__main__":
     test_collapse_detected_with_low_sigma_y()
     test_no_collapse_without_failure()
     test_failed_sequence_order()
+    test_history_buffers_match_records()
+    test_min_detect_step_delays_detection()
+    test_pratt_bridge_collapse_step()
+    test_steady_steps_reuse_solve()
+    test_run_scenarios_matches_serial()
+    test_run_batch_matches_serial()
     test_unknown_scenario_raises()
+    test_scenario_list_parsing()
     print("All Phase 6 tests passed.\n")
\ No newline at end of file
@@ -1,57 +1,99 @@
 """
 tests/test_phase7_visualization.py
 ====================================
-Phase 7: Smoke tests for visualization — no window is opened,
-figures are saved to a temp directory and then deleted.
+Phase 7: Smoke tests for visualization — no window is opened.
+Figures are inspected as objects (axes and artists) and closed; only
+one test goes through save_path, to check the file is written.
 
 Checks:
-  - plot_frame() runs without error and produces a file
-  - plot_collapse_sequence() runs without error
+  - plot_frame() draws every member on a 3D axis (as line collections)
+  - plot_collapse_sequence() draws every member and labels each failure
+  - FramePlotter.update() reuses its artists and moves failed members to the dashed set
   - plot_entropy() runs without error and produces a file
+  - plot_entropy() marks the collapse step when collapse is detected
+  - The animation's vectorized entropy normalization matches max_entropy per step
+  - Adaptive frame selection keeps the endpoints, the collapse step and large changes
+  - Plot metric arrays read from HistoryBuffers match the per-step records
+  - animate_collapse() writes one GIF frame per selected step
+  - Without ffmpeg, MP4 output fails before any figure is drawn
+  - The ffmpeg pipe writer sends raw RGBA frames with palettegen (GIF) or libx264 (MP4)
 """
 
 import sys
 import dataclasses
 import os
+import io
 import tempfile
+import contextlib
+import subprocess
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import numpy as np
 import matplotlib
 matplotlib.use("Agg")  # Non-interactive backend — no window, safe for testing
+import matplotlib.pyplot as plt
+import matplotlib.animation as mpl_animation
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 
+from core.models import EnergyState, EntropyRecord, SimulationResult
 from structure.frames import frame_2d_simple
 from solver.equilibrium import solve
-from entropy.metrics import compute
+from entropy.metrics import compute, max_entropy
 from simulation.runner import run
-from visualization.graph_view import plot_frame, plot_collapse_sequence
-from visualization.entropy_plot import plot_entropy
+from visualization.graph_view import plot_frame, plot_collapse_sequence, FramePlotter
+from visualization.entropy_plot import plot_entropy, _metric_arrays
+from visualization.animation import animate_collapse, _compute_normalized_entropy, _select_frames
 
 
-def test_plot_frame_saves_file():
-    """plot_frame() saves a PNG without crashing."""
+def _member_line_count(ax) -> int:
+    """Number of member segments drawn on a 3D axis as Line3DCollections."""
+    ax.figure.canvas.draw()  # Segments are projected (and counted) on draw
+    return sum(len(c.get_segments()) for c in ax.collections if isinstance(c, Line3DCollection))
+
+
+def test_plot_frame_draws_members():
+    """plot_frame() builds a 3D figure with one line per member."""
     frame = frame_2d_simple.build()
     es = solve(frame, step=0)
     er = compute(es, previous_entropy=0.0)
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        path = os.path.join(tmpdir, "frame_test.png")
-        fig = plot_frame(frame, es, er, step=0, show=False, save_path=path)
-        assert os.path.exists(path), "Frame plot file was not created"
-        assert fig is not None
-    print("  PASS: plot_frame() saved file successfully")
+    fig = plot_frame(frame, es, er, step=0, show=False)
+    ax = fig.axes[0]
+    assert ax.name == "3d"
+    assert _member_line_count(ax) == len(frame.members)
+    plt.close(fig)
+    print("  PASS: plot_frame() rendered all members")
 
 
-def test_plot_collapse_sequence_saves_file():
-    """plot_collapse_sequence() saves a PNG without crashing."""
+def test_plot_collapse_sequence_labels_failures():
+    """plot_collapse_sequence() draws every member and labels the failures."""
     frame = frame_2d_simple.build()
     failed_sequence = [0, 1]  # Simulate both members failed
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        path = os.path.join(tmpdir, "collapse_test.png")
-        fig = plot_collapse_sequence(frame, failed_sequence, show=False, save_path=path)
-        assert os.path.exists(path)
-        assert fig is not None
-    print("  PASS: plot_collapse_sequence() saved file successfully")
+    fig = plot_collapse_sequence(frame, failed_sequence, show=False)
+    ax = fig.axes[0]
+    assert _member_line_count(ax) == len(frame.members)
+    assert len(ax.texts) == len(failed_sequence)
+    plt.close(fig)
+    print("  PASS: plot_collapse_sequence() rendered all members")
+
+
+def test_frame_plotter_update_reuses_artists():
+    """FramePlotter.update() redraws a later step in the same figure and collections."""
+    frame = frame_2d_simple.build()
+    es = solve(frame, step=0)
+    plotter = FramePlotter(frame)
+    plotter.update(es, compute(es), step=0)
+    collections = list(plotter.ax.collections)
+
+    frame.members[0].failed = True
+    es = solve(frame, step=1)
+    plotter.update(es, compute(es), step=1)
+    assert list(plotter.ax.collections) == collections
+    assert _member_line_count(plotter.ax) == len(frame.members)
+    assert "Step 1" in plotter.ax.get_title()
+    plt.close(plotter.fig)
+    print("  PASS: FramePlotter.update() reused the figure")
 
 
 def test_plot_entropy_saves_file():
@@ -67,28 +109,198 @@ def test_plot_entropy_saves_file():
         fig = plot_entropy(result, show=False, save_path=path)
         assert os.path.exists(path)
         assert fig is not None
+    plt.close(fig)
     print("  PASS: plot_entropy() saved file successfully")
 
 
+def _collapsed_result(n_steps: int = 20, collapse_step: int = 15) -> SimulationResult:
+    """
+    Build a small SimulationResult with a collapse, without running the solver.
+
+    Four members; members 0 and 1 are marked failed from collapse_step on and
+    entropy falls by 0.1 per step.
+    """
+    energy_history, entropy_history = [], []
+    for i in range(n_steps):
+        failed = np.zeros(4, dtype=bool)
+        if i >= collapse_step:
+            failed[:2] = True
+        energy_history.append(EnergyState(
+            step=i,
+            total_energy=4.0,
+            member_ids=np.arange(4),
+            strain_energy=np.ones(4),
+            axial_force=np.zeros(4),
+            deformation=np.zeros(4),
+            failed=failed,
+        ))
+        entropy_history.append(EntropyRecord(
+            step=i,
+            entropy=1.0 - 0.1 * i,
+            delta_entropy=-0.1,
+            energy_distribution=(np.arange(4), np.full(4, 0.25)),
+        ))
+    return SimulationResult(
+        frame_name="test",
+        energy_history=energy_history,
+        entropy_history=entropy_history,
+        collapse_detected=True,
+        collapse_step=collapse_step,
+        failed_sequence=[0, 1],
+    )
+
+
 def test_plot_entropy_with_collapse():
     """plot_entropy() handles collapse_detected=True without crashing."""
+    result = _collapsed_result()
+
+    fig = plot_entropy(result, show=False)
+    assert len(fig.axes) == 3
+    for ax in fig.axes:
+        assert any(line.get_color() == "red" for line in ax.lines), "Collapse marker missing"
+    plt.close(fig)
+    print("  PASS: plot_entropy() with collapse rendered correctly")
+
+
+def test_animation_normalized_entropy():
+    """_compute_normalized_entropy equals S / max_entropy(n_active) step by step."""
+    result = _collapsed_result()
+    expected = []
+    for es, er in zip(result.energy_history, result.entropy_history):
+        s_max = max_entropy(int(np.count_nonzero(~es.failed)))
+        expected.append(er.entropy / s_max if s_max > 0 else 0.0)
+    assert np.allclose(_compute_normalized_entropy(result), expected, rtol=1e-12)
+    print("  PASS: Vectorized entropy normalization matches max_entropy")
+
+
+def test_select_frames():
+    """_select_frames keeps every step at 0.0 and skips quiet steps above it."""
+    entropy_norm = np.array([1.0, 1.0, 0.99, 0.98, 0.5, 0.5, 0.5, 0.5])
+    gini = [0.0, 0.0, 0.0, 0.0, 0.4, 0.4, 0.4, 0.4]
+    assert _select_frames(entropy_norm, gini, None, 0.0) == list(range(8))
+    # The two 0.01 drifts add up to a frame at step 3; step 6 is the collapse
+    assert _select_frames(entropy_norm, gini, 6, 0.02) == [0, 3, 4, 6, 7]
+    print("  PASS: Adaptive frame selection")
+
+
+def test_metric_arrays_match_records():
+    """_metric_arrays gives the same values from result.history as from entropy_history."""
     frame = frame_2d_simple.build()
     for m in frame.members:
-        m.material = dataclasses.replace(m.material, sigma_y=1.0)
+        m.material = dataclasses.replace(m.material, sigma_y=1e20)
+    result = run(frame, max_steps=5, collapse_method="threshold", collapse_threshold=-999)
+
+    from_history = _metric_arrays(result)
+    from_records = _metric_arrays(dataclasses.replace(result, history=None))
+    for a, b in zip(from_history, from_records):
+        assert np.allclose(a, b, rtol=1e-6)
+
+    # Hand-built records carry no gini; it is computed from p, not plotted as 0
+    records = [
+        EntropyRecord(step=i, entropy=0.0, delta_entropy=0.0,
+                      energy_distribution=(np.arange(3), np.array([0.7, 0.2, 0.1])))
+        for i in range(3)
+    ]
+    bare = dataclasses.replace(result, entropy_history=records, history=None)
+    assert np.allclose(_metric_arrays(bare)[3], 0.4, atol=1e-6)
+    print("  PASS: History-buffer metric arrays match the records")
 
-    result = run(frame, max_steps=20, collapse_method="threshold", collapse_threshold=-0.01)
 
+def test_animate_collapse_writes_gif():
+    """animate_collapse() writes a GIF with one frame per step at the requested size."""
+    from PIL import Image
+
+    result = _collapsed_result(n_steps=6, collapse_step=4)
     with tempfile.TemporaryDirectory() as tmpdir:
-        path = os.path.join(tmpdir, "entropy_collapse_test.png")
-        fig = plot_entropy(result, show=False, save_path=path)
-        assert os.path.exists(path)
-    print("  PASS: plot_entropy() with collapse rendered correctly")
+        path = os.path.join(tmpdir, "collapse_test.gif")
+        animate_collapse(result, frame=None, output_path=path, dpi=20)
+        with Image.open(path) as gif:
+            assert gif.n_frames == 6
+            assert gif.size == (200, 160)
+    print("  PASS: animate_collapse() wrote every frame")
+
+
+def test_animate_mp4_without_ffmpeg_fails_early():
+    """Without ffmpeg, MP4 output raises before printing or opening a figure."""
+    if mpl_animation.FFMpegWriter.isAvailable():
+        print("  SKIP: ffmpeg is installed")
+        return
+    plt.close("all")
+    out = io.StringIO()
+    with tempfile.TemporaryDirectory() as tmpdir, contextlib.redirect_stdout(out):
+        try:
+            animate_collapse(_collapsed_result(n_steps=4, collapse_step=2), frame=None,
+                             output_path=os.path.join(tmpdir, "collapse.mp4"))
+            assert False, "Should have raised RuntimeError"
+        except RuntimeError:
+            pass
+    assert out.getvalue() == "", f"Nothing should be printed, got {out.getvalue()!r}"
+    assert plt.get_fignums() == [], "No figure should be created"
+    print("  PASS: MP4 without ffmpeg failed before rendering")
+
+
+class _FakePopen:
+    """Stands in for the ffmpeg process: records argv and the bytes piped to stdin."""
+    instances = []
+
+    def __init__(self, argv, **kwargs):
+        self.argv = argv
+        self.stdin = io.BytesIO()
+        self.returncode = None
+        _FakePopen.instances.append(self)
+
+    def communicate(self):
+        self.returncode = 0
+        return b"", b""
+
+    def kill(self):
+        pass
+
+    def wait(self):
+        return self.returncode
+
+
+def test_ffmpeg_pipe_writer_streams_raw_frames():
+    """With ffmpeg available, GIF and MP4 frames are piped as raw RGBA with the right codec args."""
+    saved_popen = subprocess.Popen
+    mpl_animation.FFMpegWriter.isAvailable = classmethod(lambda cls: True)
+    subprocess.Popen = _FakePopen
+    _FakePopen.instances = []
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for ext in ("gif", "mp4"):
+                path = os.path.join(tmpdir, f"collapse.{ext}")
+                animate_collapse(_collapsed_result(n_steps=6, collapse_step=4), frame=None,
+                                 output_path=path, dpi=20)
+    finally:
+        subprocess.Popen = saved_popen
+        del mpl_animation.FFMpegWriter.isAvailable  # Back to MovieWriter.isAvailable
 
+    gif_proc, mp4_proc = _FakePopen.instances
+    for proc, path_ext in ((gif_proc, "gif"), (mp4_proc, "mp4")):
+        argv = proc.argv
+        assert argv[argv.index("-f") + 1] == "rawvideo"
+        assert argv[argv.index("-pix_fmt") + 1] == "rgba"
+        assert argv[argv.index("-s") + 1] == "200x160"
+        assert argv[argv.index("-r") + 1] == "10"
+        assert argv[argv.index("-i") + 1] == "-"
+        assert argv[-1].endswith(f"collapse.{path_ext}")
+        assert len(proc.stdin.getvalue()) == 6 * 200 * 160 * 4, "Expected 6 raw RGBA frames"
+    assert any("palettegen" in arg for arg in gif_proc.argv), "GIF should use palettegen"
+    assert "libx264" in mp4_proc.argv and "palettegen" not in " ".join(mp4_proc.argv)
+    print("  PASS: ffmpeg pipe writer streamed raw RGBA frames for GIF and MP4")
 
 if __name__ == "__main__":
     print("=== Phase 7: Visualization ===")
-    test_plot_frame_saves_file()
-    test_plot_collapse_sequence_saves_file()
+    test_plot_frame_draws_members()
+    test_plot_collapse_sequence_labels_failures()
+    test_frame_plotter_update_reuses_artists()
     test_plot_entropy_saves_file()
     test_plot_entropy_with_collapse()
+    test_animation_normalized_entropy()
+    test_select_frames()
+    test_metric_arrays_match_records()
+    test_animate_collapse_writes_gif()
+    test_animate_mp4_without_ffmpeg_fails_early()
+    test_ffmpeg_pipe_writer_streams_raw_frames()
     print("All Phase 7 tests passed.\n")
\ No newline at end of file
@@ -16,12 +16,19 @@ The 3D frame diagram is intentionally excluded — it does not deform
 visually and caused zoom/scaling issues in animation.
 
 Output formats:
-  .gif  — universal, no extra codec required
+  .gif  — universal; encoded by ffmpeg if on PATH, otherwise by Pillow
   .mp4  — requires ffmpeg on PATH, smaller file, higher quality
 
+The static curves are drawn once; each frame only redraws the moving
+marker and label on a copy of that background, and the raw canvas
+buffer is streamed to the encoder.
+
 Consumed by main.py via the --animate flag.
 """
 
+import subprocess
+import importlib.util
+
 import numpy as np
 import matplotlib
 matplotlib.use("Agg")
@@ -30,7 +37,8 @@ import matplotlib.animation as animation
 import matplotlib.patches as mpatches
 
 from core.models import FrameData, SimulationResult
-from entropy.metrics import max_entropy
+from entropy.metrics import normalized_entropy_batch
+from visualization.entropy_plot import _active_member_counts, _metric_arrays
 
 
 def animate_collapse(
@@ -39,6 +47,7 @@ def animate_collapse(
     output_path: str,
     fps: int = 10,
     dpi: int = 120,
+    min_change: float = 0.0,
 ) -> None:
     """
     Render and save an animated entropy analysis for a completed simulation.
@@ -55,27 +64,32 @@ def animate_collapse(
                      format: ".gif" uses Pillow writer, ".mp4" uses ffmpeg.
         fps: Frames per second for the animation (default 10).
         dpi: Output resolution in dots per inch (default 120).
+        min_change: Skip steps whose change in S/S_max plus change in Gini,
+                    measured from the last rendered step, is below this
+                    value. The first and last steps and the collapse step
+                    are always rendered. 0.0 (default) renders every step.
 
     Raises:
         ValueError: If output_path does not end in ".gif" or ".mp4".
+        RuntimeError: If no encoder for the format is installed (checked
+                      before anything is drawn).
     """
     ext = output_path.rsplit(".", 1)[-1].lower()
     if ext not in ("gif", "mp4"):
         raise ValueError(f"Unsupported output format '.{ext}'. Use '.gif' or '.mp4'.")
+    use_ffmpeg = _check_encoder(ext)
 
     n_steps = len(result.energy_history)
     if n_steps == 0:
         raise ValueError("SimulationResult has no steps to animate.")
 
-    steps         = [r.step for r in result.entropy_history]
-    entropy_norm  = _compute_normalized_entropy(result)
-    delta_entropy = [r.delta_entropy for r in result.entropy_history]
-    gini          = [_gini(r.energy_distribution) for r in result.entropy_history]
+    steps, _, delta_entropy, gini = _metric_arrays(result)
+    entropy_norm = _compute_normalized_entropy(result)
 
     fig, (ax_s, ax_ds, ax_gini) = plt.subplots(3, 1, figsize=(10, 8), sharex=True)
     fig.suptitle(f"Entropy Analysis — {result.frame_name}", fontsize=13, fontweight="bold")
 
-    x_max = max(steps) + 1
+    x_max = int(steps.max()) + 1
 
     # --- Static curves ---
     ax_s.plot(steps, entropy_norm, color="steelblue", linewidth=2)
@@ -144,25 +158,35 @@ def animate_collapse(
         Returns:
             List of updated artists.
         """
-        x = result.entropy_history[step_idx].step
+        x = steps[step_idx]
         for marker in markers:
             marker.set_xdata([x, x])
         step_label.set_text(f"Step {step_idx + 1} / {n_steps}")
         return markers + [step_label]
 
-    anim = animation.FuncAnimation(
-        fig,
-        update,
-        frames=n_steps,
-        interval=1000 // fps,
-        repeat=False,
-        blit=True,
-    )
-
-    writer = _get_writer(ext, fps)
-    print(f"  Rendering {n_steps} frames to {output_path} ...")
-    anim.save(output_path, writer=writer, dpi=dpi)
-    plt.close(fig)
+    frames = _select_frames(entropy_norm, gini, result.collapse_step, min_change)
+
+    # Draw everything except the moving artists once, at output resolution.
+    # Each frame restores that background and draws only the markers and
+    # label on top, then hands the canvas buffer to the encoder as is.
+    moving = markers + [step_label]
+    for artist in moving:
+        artist.set_animated(True)
+    fig.set_dpi(dpi)
+    canvas = fig.canvas
+    try:
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
+
+        print(f"  Rendering {len(frames)} frames to {output_path} ...")
+        with _get_writer(ext, fps, output_path, canvas.get_width_height(), use_ffmpeg) as writer:
+            for step_idx in frames:
+                canvas.restore_region(background)
+                for artist in update(step_idx):
+                    fig.draw_artist(artist)
+                writer.write(np.asarray(canvas.buffer_rgba()))
+    finally:
+        plt.close(fig)
     print(f"  Saved: {output_path}")
 
 
@@ -170,7 +194,7 @@ def animate_collapse(
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _compute_normalized_entropy(result: SimulationResult) -> list[float]:
+def _compute_normalized_entropy(result: SimulationResult) -> np.ndarray:
     """
     Normalize entropy history to [0, 1] using S / S_max per step.
 
@@ -178,62 +202,171 @@ def _compute_normalized_entropy(result: SimulationResult) -> list[float]:
         result: Full simulation result.
 
     Returns:
-        List of normalized entropy values, one per step.
+        Normalized entropy values, one per step, shape (n_steps,).
     """
-    normalized = []
-    for es, er in zip(result.energy_history, result.entropy_history):
-        n_active = sum(1 for ms in es.member_states if not ms.failed)
-        s_max = max_entropy(n_active)
-        normalized.append(er.entropy / s_max if s_max > 0 else 0.0)
-    return normalized
+    entropy = _metric_arrays(result)[1]
+    return normalized_entropy_batch(entropy, _active_member_counts(result))
 
 
-def _gini(energy_distribution: list) -> float:
+def _select_frames(
+    entropy_norm: np.ndarray,
+    gini: np.ndarray,
+    collapse_step: int | None,
+    min_change: float,
+) -> list[int]:
     """
-    Compute the Gini coefficient from an energy distribution list.
+    Pick the step indices to render as animation frames.
+
+    A step is kept when |dS/S_max| + |dGini| since the last kept step
+    reaches min_change, so slow drifts still produce a frame once they
+    add up. The first and last steps and the collapse step are always kept.
 
     Args:
-        energy_distribution: List of (member_id, p_i) tuples.
+        entropy_norm: Normalized entropy per step.
+        gini: Gini index per step.
+        collapse_step: Step index at which collapse was detected, or None.
+        min_change: Change threshold; 0.0 keeps every step.
 
     Returns:
-        Gini coefficient in [0, 1].
+        Increasing list of step indices.
     """
-    if not energy_distribution:
-        return 0.0
-    values = np.array([p for _, p in energy_distribution], dtype=float)
-    values = np.sort(values)
-    n = len(values)
-    if values.sum() == 0:
-        return 0.0
-    index = np.arange(1, n + 1)
-    return float((2 * np.sum(index * values)) / (n * values.sum()) - (n + 1) / n)
-
-
-def _get_writer(ext: str, fps: int):
+    n_steps = len(entropy_norm)
+    if min_change <= 0.0:
+        return list(range(n_steps))
+
+    keep = [0]
+    for i in range(1, n_steps):
+        last = keep[-1]
+        change = abs(entropy_norm[i] - entropy_norm[last]) + abs(gini[i] - gini[last])
+        if change >= min_change or i == collapse_step or i == n_steps - 1:
+            keep.append(i)
+    return keep
+
+
+def _check_encoder(ext: str) -> bool:
     """
-    Return an appropriate matplotlib animation writer for the given format.
+    Check that an encoder for the format is installed.
+
+    Called before the figure is built, so a missing encoder fails fast
+    instead of after the frames have been set up.
 
     Args:
         ext: File extension — "gif" or "mp4".
-        fps: Frames per second.
 
     Returns:
-        matplotlib writer instance.
+        True to encode with ffmpeg, False to write the GIF with Pillow.
 
     Raises:
-        RuntimeError: If the required writer is not available.
+        RuntimeError: If the required encoder is not available.
     """
+    if animation.FFMpegWriter.isAvailable():
+        return True
+    if ext == "mp4":
+        raise RuntimeError(
+            "ffmpeg is required for MP4 output. Install from https://ffmpeg.org/"
+        )
+    if importlib.util.find_spec("PIL") is None:
+        raise RuntimeError(
+            "Pillow is required for GIF output. Install with: pip install Pillow"
+        )
+    return False
+
+
+def _get_writer(ext: str, fps: int, output_path: str, size: tuple[int, int], use_ffmpeg: bool):
+    """
+    Return a frame writer for the given format.
+
+    Frames are raw RGBA canvas buffers, so nothing is re-rendered or
+    PNG-encoded on the way to the encoder. GIFs are encoded by ffmpeg
+    when it is available (palettegen/paletteuse, faster and smaller than
+    Pillow's quantization), with Pillow as the fallback. MP4 uses libx264
+    at CRF 20 with the veryfast preset and -tune animation, which suits
+    flat plot content.
+
+    Args:
+        ext: File extension — "gif" or "mp4".
+        fps: Frames per second.
+        output_path: File to write.
+        size: Frame (width, height) in pixels.
+        use_ffmpeg: Result of _check_encoder(ext).
+
+    Returns:
+        _FFmpegPipeWriter or _PillowGifWriter.
+    """
+    if not use_ffmpeg:
+        return _PillowGifWriter(output_path, fps)
     if ext == "gif":
-        try:
-            return animation.PillowWriter(fps=fps)
-        except Exception as e:
-            raise RuntimeError(
-                "Pillow is required for GIF output. Install with: pip install Pillow"
-            ) from e
-    else:
-        try:
-            return animation.FFMpegWriter(fps=fps, bitrate=1800)
-        except Exception as e:
-            raise RuntimeError(
-                "ffmpeg is required for MP4 output. Install from https://ffmpeg.org/"
-            ) from e
\ No newline at end of file
+        return _FFmpegPipeWriter(output_path, fps, size, [
+            "-filter_complex", "split [a][b];[a] palettegen [p];[b][p] paletteuse",
+        ])
+    return _FFmpegPipeWriter(output_path, fps, size, [
+        "-vcodec", "libx264",
+        "-preset", "veryfast", "-tune", "animation", "-crf", "20",
+        "-pix_fmt", "yuv420p", "-movflags", "+faststart",
+    ])
+
+
+class _FFmpegPipeWriter:
+    """
+    Streams raw RGBA frames into an ffmpeg process through its stdin.
+
+    Used as a context manager: leaving the block normally closes stdin and
+    waits for ffmpeg to finish the file; leaving it on an exception kills
+    the process.
+    """
+
+    def __init__(self, output_path: str, fps: int, size: tuple[int, int], codec_args: list[str]):
+        width, height = size
+        self._proc = subprocess.Popen(
+            [
+                animation.FFMpegWriter.bin_path(), "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}",
+                "-r", str(fps), "-i", "-",
+                *codec_args, output_path,
+            ],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+
+    def write(self, rgba: np.ndarray) -> None:
+        """Send one (height, width, 4) uint8 frame to ffmpeg."""
+        self._proc.stdin.write(rgba.data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self._proc.kill()
+            self._proc.wait()
+            return
+        _, stderr = self._proc.communicate()
+        if self._proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+
+
+class _PillowGifWriter:
+    """
+    Collects RGBA frames and writes them as one GIF with Pillow on exit.
+    """
+
+    def __init__(self, output_path: str, fps: int):
+        from PIL import Image  # Availability checked by _check_encoder
+        self._image = Image
+        self._output_path = output_path
+        self._fps = fps
+        self._frames = []
+
+    def write(self, rgba: np.ndarray) -> None:
+        """Copy one (height, width, 4) uint8 frame; the canvas buffer is reused."""
+        self._frames.append(self._image.fromarray(rgba.copy()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None and self._frames:
+            self._frames[0].save(
+                self._output_path, save_all=True, append_images=self._frames[1:],
+                duration=int(1000 / self._fps), loop=0,
+            )
+        self._frames = []
@@ -19,13 +19,16 @@ import matplotlib.patches as mpatches
 import numpy as np
 
 from core.models import SimulationResult
-from entropy.metrics import max_entropy
+from entropy.metrics import normalized_entropy_batch
+from entropy.localization import localization_index
+from visualization.graph_view import save_figure
 
 
 def plot_entropy(
     result: SimulationResult,
     show: bool = True,
-    save_path: str | None = None
+    save_path: str | None = None,
+    dpi: int = 150,
 ) -> plt.Figure:
     """
     Render the full entropy analysis figure for a completed simulation.
@@ -42,22 +45,15 @@ def plot_entropy(
         result: Completed SimulationResult from runner.run().
         show: Whether to call plt.show() immediately.
         save_path: If provided, saves figure to this path.
+        dpi: Resolution of the saved figure (default 150).
 
     Returns:
-        matplotlib Figure object.
+        matplotlib Figure object (closed in pyplot if saved).
     """
-    steps = [r.step for r in result.entropy_history]
-    entropy = [r.entropy for r in result.entropy_history]
-    delta_entropy = [r.delta_entropy for r in result.entropy_history]
-    gini = [_gini(r.energy_distribution) for r in result.entropy_history]
+    steps, entropy, delta_entropy, gini = _metric_arrays(result)
 
     # Normalize entropy to [0, 1]
-    n_members_per_step = _active_member_counts(result)
-    s_max_per_step = [max_entropy(n) for n in n_members_per_step]
-    entropy_norm = [
-        s / s_max if s_max > 0 else 0.0
-        for s, s_max in zip(entropy, s_max_per_step)
-    ]
+    entropy_norm = normalized_entropy_batch(entropy, _active_member_counts(result))
 
     fig, axes = plt.subplots(3, 1, figsize=(10, 9), sharex=True)
     fig.suptitle(
@@ -80,7 +76,7 @@ def plot_entropy(
     plt.tight_layout()
 
     if save_path:
-        plt.savefig(save_path, dpi=150)
+        save_figure(fig, save_path, dpi)
     elif show:
         plt.show()
 
@@ -196,38 +192,48 @@ def _add_legend(ax, collapse_detected: bool):
 # Computation helpers
 # ---------------------------------------------------------------------------
 
-def _gini(energy_distribution: list[tuple[int, float]]) -> float:
+def _metric_arrays(
+    result: SimulationResult,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
-    Compute the Gini coefficient from an energy distribution list.
+    Return step, entropy, dS and Gini per step as NumPy arrays.
+
+    Runs recorded by simulation.runner already hold these columns in
+    result.history, so views of its first n rows are returned without
+    touching the records. Otherwise they are read from entropy_history,
+    with Gini computed from energy_distribution for records that lack it.
 
     Args:
-        energy_distribution: List of (member_id, p_i) tuples.
+        result: Full simulation result.
 
     Returns:
-        Gini coefficient in [0, 1].
-    """
-    if not energy_distribution:
-        return 0.0
-    values = np.array([p for _, p in energy_distribution], dtype=float)
-    values = np.sort(values)
-    n = len(values)
-    if values.sum() == 0:
-        return 0.0
-    index = np.arange(1, n + 1)
-    return float((2 * np.sum(index * values)) / (n * values.sum()) - (n + 1) / n)
+        (steps, entropy, delta_entropy, gini), each shape (n_steps,).
+    """
+    records = result.entropy_history
+    n = len(records)
+    history = result.history
+    if history is not None and history.n == n:
+        return history.step[:n], history.entropy[:n], history.delta[:n], history.gini[:n]
+    return (
+        np.fromiter((r.step for r in records), dtype=int, count=n),
+        np.fromiter((r.entropy for r in records), dtype=float, count=n),
+        np.fromiter((r.delta_entropy for r in records), dtype=float, count=n),
+        np.fromiter((localization_index(r) for r in records), dtype=np.float32, count=n),
+    )
 
 
-def _active_member_counts(result: SimulationResult) -> list[int]:
+def _active_member_counts(result: SimulationResult) -> np.ndarray:
     """
     Count non-failed members at each step from the energy history.
 
+    The per-step failed flags are stacked into one (n_steps, n_members)
+    array and counted in a single call.
+
     Args:
         result: Full simulation result.
 
     Returns:
-        List of active member counts per step.
+        Active member count per step, shape (n_steps,).
     """
-    return [
-        sum(1 for ms in es.member_states if not ms.failed)
-        for es in result.energy_history
-    ]
\ No newline at end of file
+    failed = np.array([es.failed for es in result.energy_history], dtype=bool)
+    return failed.shape[1] - np.count_nonzero(failed, axis=1)
\ No newline at end of file